@@ -7,11 +7,35 @@ pour un domaine spécifique et les exporte dans un fichier JSON.
 """
 
 import argparse
+import asyncio
+import functools
 import json
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+try:
+    import aiofiles
+except ImportError:  # Lecture via un pool de threads si aiofiles est absent
+    aiofiles = None
+
+try:
+    import orjson
+    ORJSON_EXPORT_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:  # Repli sur le module json standard
+    orjson = None
+
+# Lecture concurrente des proposal.json
+PROPOSAL_READ_CONCURRENCY = 32
+PROPOSAL_READ_TIMEOUT_S = 10.0
+
+# Séparateurs Markdown reconnus (titres, puces, listes numérotées)
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*)$')
+_BULLET_RE = re.compile(r'^\s*[-*·•]\s+(.*)$')
+_NUMBERED_RE = re.compile(r'^\s*\(?[A-Za-z0-9]{1,4}[.)]\s+(.*)$')
 
 
 def parse_args():
@@ -29,14 +53,64 @@ def parse_args():
         required=True,
         help="Fichier JSON de sortie"
     )
+    parser.add_argument(
+        "--include-raw-readme",
+        action="store_true",
+        help="Inclut le contenu brut du README dans le contexte exporté"
+    )
     return parser.parse_args()
 
 
-def load_domain_readme(domain: str, repo_root: Path) -> Dict[str, Any]:
-    """Charge le README du domaine et extrait les informations clés."""
-    readme_path = repo_root / "domains" / domain / "README.md"
+def _loads(data: bytes) -> Any:
+    """Parse du JSON brut (bytes) avec orjson si disponible."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _fast_json_load(path: str) -> Any:
+    """Lit un fichier JSON en bytes (sans décodage en str) et le parse."""
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
+
+@functools.lru_cache(maxsize=128)
+def _load_json_cached(path_str: str, mtime_ns: int, size: int) -> Any:
+    """Lit et parse un fichier JSON (mis en cache sur chemin, mtime et taille)."""
+    return _fast_json_load(path_str)
+
+
+def load_json_file(path: str) -> Any:
+    """
+    Charge un fichier JSON en réutilisant le résultat tant qu'il n'a pas changé.
+
+    La clé de cache inclut st_mtime_ns et st_size : toute modification du
+    fichier invalide automatiquement l'entrée.
+    """
+    st = os.stat(path)
+    return _load_json_cached(os.path.realpath(path), st.st_mtime_ns, st.st_size)
+
+
+def clear_context_file_cache():
+    """Vide le cache des fichiers JSON chargés (utile pour les tests)."""
+    _load_json_cached.cache_clear()
+
+
+def load_domain_readme(domain: str, domain_path: str, include_raw: bool = False) -> Dict[str, Any]:
+    """
+    Charge le README du domaine et extrait les informations clés.
+
+    Args:
+        domain: Nom du domaine
+        domain_path: Dossier du domaine (domains/<domain>)
+        include_raw: Inclure le contenu brut du README ("readme_content")
+
+    Returns:
+        Dictionnaire avec les informations extraites du README
+    """
+    readme_path = os.path.join(domain_path, "README.md")
 
-    if not readme_path.exists():
+    if not os.path.isfile(readme_path):
         print(f"⚠️  README not found for domain '{domain}'", file=sys.stderr)
         return {
             "name": domain,
@@ -47,114 +121,227 @@ def load_domain_readme(domain: str, repo_root: Path) -> Dict[str, Any]:
             "resources": {}
         }
 
-    with open(readme_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # Lecture et découpage en une seule passe ligne par ligne ;
+    # le contenu complet n'est gardé en mémoire que s'il est demandé
+    with open(readme_path, 'r', encoding='utf-8', buffering=64 * 1024) as f:
+        if include_raw:
+            content = f.read()
+            sections = _parse_sections_stream(content.splitlines())
+        else:
+            sections = _parse_sections_stream(f)
 
     # Extraction basique des sections
     domain_info = {
         "name": domain,
         "exists": True,
-        "readme_content": content,
-        "description": extract_description(content),
-        "objectives": extract_section_list(content, "Objectifs"),
-        "subdomains": extract_section_list(content, "Sous-domaines"),
-        "resources": extract_section_dict(content, "Ressources")
+        "description": extract_description(sections),
+        "objectives": extract_section_list(sections, "Objectifs"),
+        "subdomains": extract_section_list(sections, "Sous-domaines"),
+        "resources": extract_section_dict(sections, "Ressources")
     }
 
+    if include_raw:
+        domain_info["readme_content"] = content
+
     return domain_info
 
 
-def extract_description(content: str) -> str:
-    """Extrait la première description du README."""
-    lines = content.split('\n')
-    for i, line in enumerate(lines):
-        if line.startswith('#') and i + 2 < len(lines):
-            # Retourne la ligne suivant le premier titre
-            next_line = lines[i + 2].strip()
-            if next_line and not next_line.startswith('#'):
-                return next_line
-    return ""
+def _parse_sections_stream(lines: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Découpe un README Markdown en sections délimitées par les titres.
 
+    Les lignes (fichier ouvert ou liste) sont consommées une seule fois,
+    sans matérialiser le contenu complet. Chaque section a la forme
+    {"title": str, "level": int, "lines": [...], "children": [...]} où
+    "lines" ne contient que les lignes propres à la section (avant le
+    premier sous-titre). La section racine "" (niveau 0) regroupe les
+    lignes précédant le premier titre.
 
-def extract_section_list(content: str, section_name: str) -> List[str]:
-    """Extrait une liste d'items d'une section."""
+    Returns:
+        Dictionnaire {titre: section} dans l'ordre du document
+        (en cas de doublon, la première occurrence est conservée)
+    """
+    root = {"title": "", "level": 0, "lines": [], "children": []}
+    sections = {"": root}
+    stack = [root]
+
+    for raw_line in lines:
+        line = raw_line.rstrip('\r\n')
+        heading = _HEADING_RE.match(line)
+        if heading:
+            level = len(heading.group(1))
+            section = {
+                "title": heading.group(2).strip('# '),
+                "level": level,
+                "lines": [],
+                "children": []
+            }
+            while stack[-1]["level"] >= level:
+                stack.pop()
+            stack[-1]["children"].append(section)
+            stack.append(section)
+            sections.setdefault(section["title"], section)
+        else:
+            stack[-1]["lines"].append(line)
+
+    return sections
+
+
+def _list_items(lines: List[str]) -> List[str]:
+    """Extrait le texte des items de liste (puces ou numéros) d'un bloc de lignes."""
     items = []
-    in_section = False
+    for line in lines:
+        match = _BULLET_RE.match(line) or _NUMBERED_RE.match(line)
+        if match:
+            items.append(match.group(1).strip())
+    return items
 
-    for line in content.split('\n'):
-        if section_name.lower() in line.lower() and line.startswith('#'):
-            in_section = True
-            continue
 
-        if in_section:
-            if line.startswith('#'):
-                break
-            if line.strip().startswith('-') or line.strip().startswith('*'):
-                items.append(line.strip()[1:].strip())
+def _find_section(sections: Dict[str, Dict[str, Any]], section_name: str) -> Optional[Dict[str, Any]]:
+    """Retourne la première section dont le titre contient section_name."""
+    name = section_name.lower()
+    for title, section in sections.items():
+        if title and name in title.lower():
+            return section
+    return None
 
-    return items
 
+def extract_description(sections: Dict[str, Dict[str, Any]]) -> str:
+    """Extrait la première description du README."""
+    for title, section in sections.items():
+        if not title:
+            continue
+        # Première ligne non vide suivant un titre
+        for line in section["lines"]:
+            if line.strip():
+                return line.strip()
+    return ""
 
-def extract_section_dict(content: str, section_name: str) -> Dict[str, str]:
-    """Extrait un dictionnaire de clés/valeurs d'une section."""
-    section_dict = {}
-    in_section = False
-    current_subsection = None
 
-    for line in content.split('\n'):
-        if section_name.lower() in line.lower() and line.startswith('#'):
-            in_section = True
-            continue
+def extract_section_list(sections: Dict[str, Dict[str, Any]], section_name: str) -> List[str]:
+    """Extrait une liste d'items d'une section."""
+    section = _find_section(sections, section_name)
+    if section is None:
+        return []
 
-        if in_section:
-            if line.startswith('#'):
-                if line.startswith('##'):
-                    break
-                current_subsection = line.strip('# ').strip()
-                section_dict[current_subsection] = []
-            elif line.strip().startswith('-') and current_subsection:
-                section_dict[current_subsection].append(line.strip()[1:].strip())
+    return _list_items(section["lines"])
 
-    return section_dict
 
+def extract_section_dict(sections: Dict[str, Dict[str, Any]], section_name: str) -> Dict[str, List[str]]:
+    """Extrait un dictionnaire {sous-section: items} d'une section."""
+    section = _find_section(sections, section_name)
+    if section is None:
+        return {}
 
-def load_emission_factors(repo_root: Path) -> Dict[str, Any]:
-    """Charge les facteurs d'émission depuis le fichier JSON scientifique."""
-    emission_factors_path = repo_root / "context" / "scientific-data" / "emission_factors.json"
+    return {
+        subsection["title"]: _list_items(subsection["lines"])
+        for subsection in section["children"]
+    }
 
-    if not emission_factors_path.exists():
+
+def load_emission_factors(emission_factors_path: str) -> Dict[str, Any]:
+    """Charge les facteurs d'émission depuis le fichier JSON scientifique."""
+    if not os.path.isfile(emission_factors_path):
         print(f"⚠️  Emission factors file not found", file=sys.stderr)
         return {}
 
-    with open(emission_factors_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_json_file(emission_factors_path)
 
 
-def list_existing_proposals(domain: str, repo_root: Path) -> List[Dict[str, Any]]:
-    """Liste les propositions existantes pour un domaine."""
-    proposals_dir = repo_root / "domains" / domain / "proposals"
-    proposals = []
+async def _read_proposal(path: str, semaphore: asyncio.Semaphore) -> Any:
+    """Lit un proposal.json de façon asynchrone (concurrence bornée, timeout)."""
+    async with semaphore:
+        if aiofiles is None:
+            coro = asyncio.to_thread(load_json_file, path)
+        else:
+            coro = _read_json_aiofiles(path)
+        # Le timeout évite de bloquer sur un système de fichiers synchronisé (cloud)
+        return await asyncio.wait_for(coro, timeout=PROPOSAL_READ_TIMEOUT_S)
+
+
+async def _read_json_aiofiles(path: str) -> Any:
+    """Lit et parse un fichier JSON avec aiofiles."""
+    async with aiofiles.open(path, 'rb') as f:
+        return _loads(await f.read())
+
+
+async def _read_proposals(paths: List[str]) -> List[Any]:
+    """Lit tous les proposal.json en parallèle."""
+    semaphore = asyncio.Semaphore(PROPOSAL_READ_CONCURRENCY)
+    return await asyncio.gather(*[_read_proposal(p, semaphore) for p in paths])
+
+
+def read_proposals_concurrently(paths: List[str]) -> List[Any]:
+    """
+    Lit une liste de proposal.json en parallèle.
+
+    Utilise asyncio.run si aucune boucle d'événements ne tourne ; sinon
+    (appel depuis du code asynchrone) se replie sur un pool de threads.
+    """
+    if not paths:
+        return []
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_read_proposals(paths))
 
-    if not proposals_dir.exists():
-        return proposals
+    with ThreadPoolExecutor(max_workers=PROPOSAL_READ_CONCURRENCY) as executor:
+        return list(executor.map(load_json_file, paths))
+
+
+def _scan_proposal_dirs(domain_path: str) -> List[Tuple[os.DirEntry, str]]:
+    """Retourne les (dossier, proposal.json) des propositions d'un domaine."""
+    proposals_dir = os.path.join(domain_path, "proposals")
+    found = []
+
+    if not os.path.isdir(proposals_dir):
+        return found
 
     # Parcourir tous les sous-dossiers de propositions
-    for proposal_dir in proposals_dir.iterdir():
-        if proposal_dir.is_dir():
-            proposal_json = proposal_dir / "proposal.json"
-            if proposal_json.exists():
-                with open(proposal_json, 'r', encoding='utf-8') as f:
-                    proposal_data = json.load(f)
-                    proposals.append({
-                        "id": proposal_dir.name,
-                        "path": str(proposal_dir.relative_to(repo_root)),
-                        "data": proposal_data
-                    })
-
-    return proposals
-
-
-def get_repo_stats(repo_root: Path) -> Dict[str, Any]:
+    # (os.scandir réutilise les métadonnées de la lecture du dossier)
+    with os.scandir(proposals_dir) as it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            proposal_json = os.path.join(entry.path, "proposal.json")
+            if os.path.isfile(proposal_json):
+                found.append((entry, proposal_json))
+
+    return found
+
+
+def _build_proposals_list(found: List[Tuple[os.DirEntry, str]], proposals_data: List[Any],
+                          repo_root: str) -> List[Dict[str, Any]]:
+    """Assemble la liste des propositions à partir des fichiers lus."""
+    return [
+        {
+            "id": entry.name,
+            "path": os.path.relpath(entry.path, repo_root),
+            "data": proposal_data
+        }
+        for (entry, _), proposal_data in zip(found, proposals_data)
+    ]
+
+
+def list_existing_proposals(domain_path: str, repo_root: str) -> List[Dict[str, Any]]:
+    """Liste les propositions existantes pour un domaine."""
+    found = _scan_proposal_dirs(domain_path)
+
+    # Les lectures sont indépendantes : on les lance en parallèle
+    proposals_data = read_proposals_concurrently([path for _, path in found])
+
+    return _build_proposals_list(found, proposals_data, repo_root)
+
+
+async def list_existing_proposals_async(domain_path: str, repo_root: str) -> List[Dict[str, Any]]:
+    """Version asynchrone de list_existing_proposals."""
+    found = await asyncio.to_thread(_scan_proposal_dirs, domain_path)
+    proposals_data = await _read_proposals([path for _, path in found])
+    return _build_proposals_list(found, proposals_data, repo_root)
+
+
+def get_repo_stats(domains_dir: str) -> Dict[str, Any]:
     """Collecte des statistiques sur le repository."""
     stats = {
         "total_domains": 0,
@@ -162,26 +349,34 @@ def get_repo_stats(repo_root: Path) -> Dict[str, Any]:
         "domains_list": []
     }
 
-    domains_dir = repo_root / "domains"
-    if domains_dir.exists():
-        for domain_dir in domains_dir.iterdir():
-            if domain_dir.is_dir():
-                stats["domains_list"].append(domain_dir.name)
+    if os.path.isdir(domains_dir):
+        with os.scandir(domains_dir) as it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                stats["domains_list"].append(entry.name)
                 stats["total_domains"] += 1
 
-                proposals_dir = domain_dir / "proposals"
-                if proposals_dir.exists():
-                    stats["total_proposals"] += sum(1 for p in proposals_dir.iterdir() if p.is_dir())
+                proposals_dir = os.path.join(entry.path, "proposals")
+                if os.path.isdir(proposals_dir):
+                    with os.scandir(proposals_dir) as proposals_it:
+                        stats["total_proposals"] += sum(
+                            1 for p in proposals_it if p.is_dir(follow_symlinks=False)
+                        )
 
     return stats
 
 
-def load_context(domain: str) -> Dict[str, Any]:
+async def load_context(domain: str, include_raw_readme: bool = False) -> Dict[str, Any]:
     """
     Charge tout le contexte nécessaire pour un domaine.
 
+    Les différentes sources (README, facteurs d'émission, propositions,
+    statistiques) sont indépendantes et chargées en parallèle.
+
     Args:
         domain: Nom du domaine (transport, energie, etc.)
+        include_raw_readme: Inclure le contenu brut du README
 
     Returns:
         Dictionnaire contenant tout le contexte structuré
@@ -190,14 +385,25 @@ def load_context(domain: str) -> Dict[str, Any]:
     script_dir = Path(__file__).parent
     repo_root = script_dir.parent
 
-    print(f"📊 Loading context for domain: {domain}")
-    print(f"📁 Repository root: {repo_root}")
+    # Messages regroupés et écrits en une seule fois sur stdout
+    messages = [
+        f"📊 Loading context for domain: {domain}",
+        f"📁 Repository root: {repo_root}"
+    ]
+
+    # Chemins calculés une seule fois et transmis aux différents chargeurs
+    root = str(repo_root)
+    domains_path = os.path.join(root, "domains")
+    domain_path = os.path.join(domains_path, domain)
+    ef_path = os.path.join(root, "context", "scientific-data", "emission_factors.json")
 
     # Charger les différentes sources de données
-    domain_info = load_domain_readme(domain, repo_root)
-    emission_factors = load_emission_factors(repo_root)
-    existing_proposals = list_existing_proposals(domain, repo_root)
-    repo_stats = get_repo_stats(repo_root)
+    domain_info, emission_factors, existing_proposals, repo_stats = await asyncio.gather(
+        asyncio.to_thread(load_domain_readme, domain, domain_path, include_raw_readme),
+        asyncio.to_thread(load_emission_factors, ef_path),
+        list_existing_proposals_async(domain_path, root),
+        asyncio.to_thread(get_repo_stats, domains_path)
+    )
 
     # Filtrer les facteurs d'émission pertinents pour le domaine
     relevant_factors = {}
@@ -228,14 +434,22 @@ def load_context(domain: str) -> Dict[str, Any]:
         }
     }
 
-    print(f"✅ Context loaded successfully")
-    print(f"   - Domain exists: {domain_info['exists']}")
-    print(f"   - Existing proposals: {len(existing_proposals)}")
-    print(f"   - Total domains in repo: {repo_stats['total_domains']}")
+    messages += [
+        "✅ Context loaded successfully",
+        f"   - Domain exists: {domain_info['exists']}",
+        f"   - Existing proposals: {len(existing_proposals)}",
+        f"   - Total domains in repo: {repo_stats['total_domains']}"
+    ]
+    sys.stdout.write("\n".join(messages) + "\n")
 
     return context
 
 
+def load_context_sync(domain: str, include_raw_readme: bool = False) -> Dict[str, Any]:
+    """Charge le contexte d'un domaine depuis du code synchrone."""
+    return asyncio.run(load_context(domain, include_raw_readme))
+
+
 def export_context(context: Dict[str, Any], output_path: str):
     """Exporte le contexte dans un fichier JSON."""
     from datetime import datetime
@@ -248,8 +462,11 @@ def export_context(context: Dict[str, Any], output_path: str):
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
     # Écrire le fichier JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(context, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        output_file.write_bytes(orjson.dumps(context, option=ORJSON_EXPORT_OPTIONS))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(context, f, indent=2, ensure_ascii=False)
 
     print(f"💾 Context exported to: {output_path}")
 
@@ -260,7 +477,7 @@ def main():
 
     try:
         # Charger le contexte
-        context = load_context(args.domain)
+        context = load_context_sync(args.domain, args.include_raw_readme)
 
         # Exporter le résultat
         export_context(context, args.output)
@@ -7,23 +7,96 @@ les coûts et le ROI d'une proposition sur différentes périodes.
 """
 
 import argparse
+import copy
+import functools
+import glob
+import hashlib
 import json
+import os
 import sys
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_EXPORT_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:  # Repli sur le module json standard
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # Repli sur le noyau NumPy non compilé
+    njit = None
+
+REPO_ROOT = Path(__file__).parent.parent
+EMISSION_FACTORS_PATH = REPO_ROOT / "context" / "scientific-data" / "emission_factors.json"
+
+# Version du modèle de simulation (incluse dans les métadonnées et la clé de cache)
+SIMULATION_VERSION = "1.0"
+
+# Horizon de projection et prix de la tonne de CO2 en CHF (estimation)
+SIMULATION_YEARS = 20
+CO2_PRICE_CHF = 100
+_YEARS = np.arange(1, SIMULATION_YEARS + 1)
+
+# Scénarios d'adoption (facteurs appliqués aux totaux réalistes)
+_SCENARIO_NAMES = ("pessimistic", "realistic", "optimistic")
+_SCENARIO_FACTORS = np.array([0.6, 1.0, 1.4])
+_SCENARIO_DESCRIPTIONS = (
+    "Adoption lente, difficultés de mise en œuvre",
+    "Mise en œuvre conforme aux prévisions",
+    "Adoption rapide, effets de synergie"
+)
+
+# Équivalences pour la communication des résultats
+_EQUIV_CAR_TONNES = 4.6  # tonnes CO2/an par voiture moyenne
+_EQUIV_TREE_TONNES = 0.025  # 25 kg CO2/an absorbé par arbre
+
+# Cache LRU en mémoire des simulations rapides : (clé de contenu, type) -> entrée
+# {"results": dict exporté, "scenario_totals_10y": [pessimiste, réaliste, optimiste]},
+# même format que le cache disque ; borné pour qu'un long --proposals-glob ne
+# garde pas tous les résultats
+SIMULATION_MEMO_SIZE = 256
+_SIMULATION_MEMO: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+
+
+def _memo_get(key: str) -> Optional[Dict[str, Any]]:
+    """Entrée rapide mémorisée pour une clé de contenu (None si elle est absente)."""
+    results = _SIMULATION_MEMO.get((key, "quick"))
+    if results is not None:
+        _SIMULATION_MEMO.move_to_end((key, "quick"))
+    return results
+
+
+def _memo_put(key: str, results: Dict[str, Any]):
+    """Mémorise une entrée rapide, en évinçant la moins récemment utilisée."""
+    _SIMULATION_MEMO[(key, "quick")] = results
+    _SIMULATION_MEMO.move_to_end((key, "quick"))
+    if len(_SIMULATION_MEMO) > SIMULATION_MEMO_SIZE:
+        _SIMULATION_MEMO.popitem(last=False)
+
 
 def parse_args():
     """Parse les arguments de la ligne de commande."""
     parser = argparse.ArgumentParser(
         description="Simule l'impact d'une proposition climatique"
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--proposal",
-        required=True,
         help="Fichier JSON de la proposition en entrée"
     )
+    source.add_argument(
+        "--proposals-glob",
+        help="Motif glob de plusieurs propositions simulées en un seul lot "
+             "(ex. 'domains/*/proposals/*/proposal.json') ; --output est alors un répertoire"
+    )
     parser.add_argument(
         "--type",
         choices=["quick", "detailed"],
@@ -33,135 +106,429 @@ def parse_args():
     parser.add_argument(
         "--output",
         required=True,
-        help="Fichier JSON de sortie pour les résultats"
+        help="Fichier JSON de sortie pour les résultats (répertoire avec --proposals-glob)"
+    )
+    parser.add_argument(
+        "--yearly-format",
+        choices=["records", "columns"],
+        default="records",
+        help="Format du détail annuel : liste d'objets (records) ou colonnes parallèles (columns)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Désactive le cache des résultats ({output}.cache/)"
     )
     return parser.parse_args()
 
 
+def _fast_json_load(path) -> Any:
+    """Lit un fichier JSON en bytes (sans décodage en str) et le parse, avec orjson si disponible."""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def load_proposal(proposal_path: str) -> Dict[str, Any]:
     """Charge le fichier de proposition."""
-    with open(proposal_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _fast_json_load(proposal_path)
+
+
+@dataclass(slots=True, frozen=True)
+class CO2Impact:
+    """Séries annuelles et totaux de réduction CO2 (tonnes)."""
+    years: np.ndarray
+    yearly_reductions: np.ndarray
+    cumulative_reductions: np.ndarray
+    total_5y: float
+    total_10y: float
+    total_20y: float
+
+
+@dataclass(slots=True, frozen=True)
+class EconomicImpact:
+    """Investissement, bénéfices et ROI (CHF)."""
+    total_cost: float
+    budget_breakdown: Dict[str, Any]
+    co2_price: float
+    benefits_10y: float
+    benefits_20y: float
+    roi_10y: float
+    roi_20y: float
+    payback_years: float
+    cost_per_tonne: float
+
+
+@dataclass(slots=True, frozen=True)
+class Feasibility:
+    """Critères et score de faisabilité (0-10)."""
+    duration_years: float
+    total_cost: float
+    risks_count: int
+    score: float
+
+
+@dataclass(slots=True, frozen=True)
+class SimulationResult:
+    """Résultat typé d'une simulation, converti en dict uniquement à l'export."""
+    co2: CO2Impact
+    economic: EconomicImpact
+    feasibility: Feasibility
+
+
+def _simulate_kernel_py(co2_yearly: float, ramp_up_years: float, total_cost: float,
+                        co2_price: float, risks_count: int, duration: float):
+    """
+    Noyau numérique de la simulation, spécialisé pour l'horizon de 20 ans.
+
+    Écrit en NumPy compatible Numba : compilé avec njit si Numba est
+    disponible, exécuté tel quel sinon.
+
+    Returns:
+        Tuple (réductions annuelles, cumul, total 5/10/20 ans, bénéfices 10/20 ans,
+        ROI 10/20 ans, payback, coût par tonne, score de faisabilité)
+    """
+    # Réductions annuelles avec rampe d'adoption (20 ans de projection) :
+    # montée en charge progressive puis pleine capacité
+    factors = np.minimum(np.arange(1.0, SIMULATION_YEARS + 1.0) / ramp_up_years, 1.0)
+    raw_reductions = co2_yearly * factors
+
+    # Chaque année est arrondie au centime avant d'être cumulée ; le cumul
+    # affiché ajoute la valeur brute de l'année aux années précédentes arrondies
+    reductions = np.round(raw_reductions, 2)
+    running = np.cumsum(reductions)
+    cumulative = raw_reductions.copy()
+    cumulative[1:] += running[:-1]
+
+    # Totaux sur différentes périodes (sommes des valeurs annuelles arrondies)
+    total_5y = running[4]
+    total_10y = running[9]
+    total_20y = running[19]
+
+    # Bénéfices via le prix du carbone évité, sur les totaux arrondis
+    total_10y_rounded = np.round(total_10y, 2)
+    benefits_10y = total_10y_rounded * co2_price
+    benefits_20y = np.round(total_20y, 2) * co2_price
+
+    # ROI
+    roi_10y = ((benefits_10y - total_cost) / total_cost) * 100.0 if total_cost > 0 else 0.0
+    roi_20y = ((benefits_20y - total_cost) / total_cost) * 100.0 if total_cost > 0 else 0.0
+
+    # Période de retour sur investissement (payback)
+    yearly_benefit = benefits_10y / 10.0
+    payback_years = total_cost / yearly_benefit if yearly_benefit > 0 else 999.0
+
+    # Coût par tonne de CO2 évitée
+    cost_per_tonne = total_cost / total_10y_rounded if total_10y_rounded > 0 else 0.0
+
+    # Score de faisabilité (0-10) avec pénalités
+    feasibility_score = 10.0
+    if duration > 7:
+        feasibility_score -= 1.5
+    if total_cost > 150_000_000:
+        feasibility_score -= 1.5
+    if risks_count > 3:
+        feasibility_score -= 1.0
+
+    # S'assurer que le score reste dans [0, 10]
+    feasibility_score = max(0.0, min(10.0, feasibility_score))
+
+    return (
+        reductions, cumulative, total_5y, total_10y, total_20y,
+        benefits_10y, benefits_20y, roi_10y, roi_20y,
+        payback_years, cost_per_tonne, feasibility_score
+    )
+
+
+if njit is not None:
+    # Compilé au premier appel puis mis en cache sur disque (__pycache__)
+    _simulate_kernel = njit(cache=True, error_model="numpy")(_simulate_kernel_py)
+else:
+    _simulate_kernel = _simulate_kernel_py
+
+
+def _batch_simulate_kernel(co2_yearly: np.ndarray, ramp_up_years: np.ndarray,
+                           total_cost: np.ndarray, co2_price: float,
+                           risks_count: np.ndarray, duration: np.ndarray):
+    """
+    Variante vectorisée de _simulate_kernel_py pour N propositions.
+
+    Chaque argument (sauf co2_price) est un tableau 1-D de longueur N ; les
+    séries annuelles sont calculées comme une matrice (N, 20).
+
+    Returns:
+        Même tuple que _simulate_kernel_py, avec une dimension de lot en tête
+    """
+    factors = np.minimum(_YEARS[None, :] / ramp_up_years[:, None], 1.0)
+    raw_reductions = co2_yearly[:, None] * factors
+
+    # Mêmes arrondis que _simulate_kernel_py
+    reductions = np.round(raw_reductions, 2)
+    running = np.cumsum(reductions, axis=1)
+    cumulative = raw_reductions.copy()
+    cumulative[:, 1:] += running[:, :-1]
+
+    total_5y = running[:, 4]
+    total_10y = running[:, 9]
+    total_20y = running[:, 19]
+
+    total_10y_rounded = np.round(total_10y, 2)
+    benefits_10y = total_10y_rounded * co2_price
+    benefits_20y = np.round(total_20y, 2) * co2_price
+
+    # Les divisions par zéro sont masquées par np.where
+    with np.errstate(divide="ignore", invalid="ignore"):
+        has_cost = total_cost > 0
+        roi_10y = np.where(has_cost, (benefits_10y - total_cost) / total_cost * 100.0, 0.0)
+        roi_20y = np.where(has_cost, (benefits_20y - total_cost) / total_cost * 100.0, 0.0)
+
+        yearly_benefit = benefits_10y / 10.0
+        payback_years = np.where(yearly_benefit > 0, total_cost / yearly_benefit, 999.0)
+
+        cost_per_tonne = np.where(total_10y_rounded > 0, total_cost / total_10y_rounded, 0.0)
+
+    feasibility_score = (
+        10.0
+        - 1.5 * (duration > 7)
+        - 1.5 * (total_cost > 150_000_000)
+        - 1.0 * (risks_count > 3)
+    )
+    feasibility_score = np.clip(feasibility_score, 0.0, 10.0)
+
+    return (
+        reductions, cumulative, total_5y, total_10y, total_20y,
+        benefits_10y, benefits_20y, roi_10y, roi_20y,
+        payback_years, cost_per_tonne, feasibility_score
+    )
+
+
+def _extract_inputs(proposal: Dict[str, Any]) -> Tuple[float, float, float, int, Dict[str, Any]]:
+    """
+    Extrait une seule fois les données de base d'une proposition.
+
+    Returns:
+        Tuple (CO2 annuel, durée, coût total, nombre de risques, budget)
+    """
+    content = proposal["content"]
+    budget = content["budget"]
+    return (
+        content["impact"]["co2_reduction_tonnes_yearly"],
+        content["implementation"]["total_duration_years"],
+        budget["total_chf"],
+        len(content["risks"]),
+        budget
+    )
+
+
+def _build_result(duration, total_cost, risks_count, budget: Dict[str, Any],
+                  reductions, cumulative, total_5y, total_10y, total_20y,
+                  benefits_10y, benefits_20y, roi_10y, roi_20y,
+                  payback_years, cost_per_tonne, feasibility_score) -> SimulationResult:
+    """Assemble un SimulationResult à partir des sorties du noyau."""
+    return SimulationResult(
+        co2=CO2Impact(
+            years=_YEARS,
+            yearly_reductions=reductions,
+            cumulative_reductions=cumulative,
+            total_5y=float(total_5y),
+            total_10y=float(total_10y),
+            total_20y=float(total_20y)
+        ),
+        economic=EconomicImpact(
+            total_cost=total_cost,
+            budget_breakdown=budget["breakdown"],
+            co2_price=CO2_PRICE_CHF,
+            benefits_10y=float(benefits_10y),
+            benefits_20y=float(benefits_20y),
+            roi_10y=float(roi_10y),
+            roi_20y=float(roi_20y),
+            payback_years=float(payback_years),
+            cost_per_tonne=float(cost_per_tonne)
+        ),
+        feasibility=Feasibility(
+            duration_years=duration,
+            total_cost=total_cost,
+            risks_count=risks_count,
+            score=float(feasibility_score)
+        )
+    )
 
 
-def calculate_co2_impact(proposal: Dict[str, Any]) -> Dict[str, Any]:
+def _simulate_core(proposal: Dict[str, Any]) -> SimulationResult:
     """
-    Calcule l'impact CO2 de la proposition sur différentes périodes.
+    Calcule toutes les grandeurs de la simulation en une seule passe.
 
     Args:
         proposal: La proposition à simuler
 
     Returns:
-        Dictionnaire avec les impacts CO2 calculés
+        SimulationResult avec les valeurs scalaires et les séries annuelles
     """
-    # Récupérer les données de base
-    co2_yearly = proposal["content"]["impact"]["co2_reduction_tonnes_yearly"]
-    co2_10y = proposal["content"]["impact"]["co2_reduction_tonnes_10y"]
+    co2_yearly, duration, total_cost, risks_count, budget = _extract_inputs(proposal)
 
     # Modèle de rampe d'adoption (augmentation progressive)
     # Les réductions commencent faiblement et augmentent avec le temps
-    ramp_up_years = min(3, proposal["content"]["implementation"]["total_duration_years"])
-
-    # Calculer les réductions annuelles avec rampe d'adoption
-    yearly_reductions = []
-    for year in range(1, 21):  # 20 ans de projection
-        if year <= ramp_up_years:
-            # Montée en charge progressive
-            reduction = co2_yearly * (year / ramp_up_years)
-        else:
-            # Pleine capacité
-            reduction = co2_yearly
+    ramp_up_years = min(3, duration)
+
+    outputs = _simulate_kernel(
+        float(co2_yearly), float(ramp_up_years), float(total_cost),
+        float(CO2_PRICE_CHF), risks_count, float(duration)
+    )
+    return _build_result(duration, total_cost, risks_count, budget, *outputs)
+
+
+def _simulate_batch(proposals: List[Dict[str, Any]]) -> List[SimulationResult]:
+    """
+    Calcule les simulations de plusieurs propositions en un seul appel vectorisé.
+
+    Args:
+        proposals: Les propositions à simuler
 
-        yearly_reductions.append({
+    Returns:
+        Un SimulationResult par proposition, dans le même ordre
+    """
+    if not proposals:
+        return []
+
+    inputs = [_extract_inputs(p) for p in proposals]
+    co2_yearly, duration, total_cost, risks_count, budgets = zip(*inputs)
+
+    duration_arr = np.array(duration, dtype=np.float64)
+    total_cost_arr = np.array(total_cost, dtype=np.float64)
+    outputs = _batch_simulate_kernel(
+        np.array(co2_yearly, dtype=np.float64),
+        np.minimum(duration_arr, 3.0),
+        total_cost_arr,
+        float(CO2_PRICE_CHF),
+        np.array(risks_count),
+        duration_arr
+    )
+
+    return [
+        _build_result(duration[i], total_cost[i], risks_count[i], budgets[i],
+                      *(column[i] for column in outputs))
+        for i in range(len(proposals))
+    ]
+
+
+def _to_json_dict(result: SimulationResult) -> Dict[str, Any]:
+    """Convertit un SimulationResult dans la structure JSON exportée."""
+    return {
+        "co2_impact": calculate_co2_impact(result.co2),
+        "economic_impact": calculate_economic_impact(result.economic),
+        "feasibility": assess_feasibility(result.feasibility)
+    }
+
+
+def _to_cache_entry(result: SimulationResult) -> Dict[str, Any]:
+    """
+    Entrée de cache d'une simulation rapide.
+
+    Les totaux à 10 ans des scénarios (dans l'ordre de _SCENARIO_NAMES) sont
+    gardés en liste à côté du dict exporté : l'analyse détaillée les lit
+    directement, sans parcourir ce dict.
+    """
+    return {
+        "results": _to_json_dict(result),
+        "scenario_totals_10y": _round_all(_SCENARIO_FACTORS * result.co2.total_10y, 2)
+    }
+
+
+def _round_all(values, decimals: int) -> List[float]:
+    """Arrondit un ensemble de valeurs en un seul appel NumPy."""
+    return np.round(np.asarray(values, dtype=np.float64), decimals).tolist()
+
+
+def calculate_co2_impact(result: CO2Impact) -> Dict[str, Any]:
+    """
+    Met en forme l'impact CO2 de la proposition sur différentes périodes.
+
+    Args:
+        result: L'impact CO2 calculé par _simulate_core
+
+    Returns:
+        Dictionnaire avec les impacts CO2 calculés
+    """
+    yearly_reductions = [
+        {
             "year": year,
-            "reduction_tonnes": round(reduction, 2),
-            "cumulative_tonnes": round(sum(r["reduction_tonnes"] for r in yearly_reductions) + reduction, 2)
-        })
+            "reduction_tonnes": reduction,
+            "cumulative_tonnes": cumul
+        }
+        for year, reduction, cumul in zip(
+            result.years.tolist(),
+            _round_all(result.yearly_reductions, 2),
+            _round_all(result.cumulative_reductions, 2)
+        )
+    ]
+
+    # Matrice scénario × période (5, 10, 20 ans) en un seul produit vectorisé,
+    # arrondie en un seul appel ; la ligne "réaliste" (facteur 1.0) donne les totaux
+    period_totals = np.array([result.total_5y, result.total_10y, result.total_20y])
+    scenario_totals = _round_all(_SCENARIO_FACTORS[:, None] * period_totals[None, :], 2)
+    total_5y, total_10y, total_20y = scenario_totals[_SCENARIO_NAMES.index("realistic")]
 
-    # Calculer les totaux sur différentes périodes
-    total_5y = sum(r["reduction_tonnes"] for r in yearly_reductions[:5])
-    total_10y = sum(r["reduction_tonnes"] for r in yearly_reductions[:10])
-    total_20y = sum(r["reduction_tonnes"] for r in yearly_reductions[:20])
+    cars_10y, trees_10y = _round_all([
+        result.total_10y / _EQUIV_CAR_TONNES,
+        result.total_10y / _EQUIV_TREE_TONNES
+    ], 0)
 
     # Scénarios optimiste/pessimiste
     scenarios = {
-        "pessimistic": {
-            "factor": 0.6,
-            "total_10y": round(total_10y * 0.6, 2),
-            "total_20y": round(total_20y * 0.6, 2),
-            "description": "Adoption lente, difficultés de mise en œuvre"
-        },
-        "realistic": {
-            "factor": 1.0,
-            "total_10y": round(total_10y, 2),
-            "total_20y": round(total_20y, 2),
-            "description": "Mise en œuvre conforme aux prévisions"
-        },
-        "optimistic": {
-            "factor": 1.4,
-            "total_10y": round(total_10y * 1.4, 2),
-            "total_20y": round(total_20y * 1.4, 2),
-            "description": "Adoption rapide, effets de synergie"
+        name: {
+            "factor": factor,
+            "total_10y": totals[1],
+            "total_20y": totals[2],
+            "description": description
         }
+        for name, factor, totals, description in zip(
+            _SCENARIO_NAMES, _SCENARIO_FACTORS.tolist(), scenario_totals, _SCENARIO_DESCRIPTIONS
+        )
     }
 
     return {
         "yearly_breakdown": yearly_reductions,
         "totals": {
-            "5_years": round(total_5y, 2),
-            "10_years": round(total_10y, 2),
-            "20_years": round(total_20y, 2)
+            "5_years": total_5y,
+            "10_years": total_10y,
+            "20_years": total_20y
         },
         "scenarios": scenarios,
         "equivalent": {
-            "cars_10y": round(total_10y / 4.6, 0),  # 4.6 tonnes CO2/an par voiture moyenne
-            "trees_10y": round(total_10y / 0.025, 0),  # 25 kg CO2/an absorbé par arbre
+            "cars_10y": cars_10y,
+            "trees_10y": trees_10y,
             "description": "Équivalent à retirer X voitures de la circulation pendant 10 ans"
         }
     }
 
 
-def calculate_economic_impact(proposal: Dict[str, Any], co2_impact: Dict[str, Any]) -> Dict[str, Any]:
+def calculate_economic_impact(result: EconomicImpact) -> Dict[str, Any]:
     """
-    Calcule l'impact économique et le ROI de la proposition.
+    Met en forme l'impact économique et le ROI de la proposition.
 
     Args:
-        proposal: La proposition
-        co2_impact: Les impacts CO2 calculés
+        result: L'impact économique calculé par _simulate_core
 
     Returns:
         Dictionnaire avec les impacts économiques
     """
-    total_cost = proposal["content"]["budget"]["total_chf"]
-    co2_price = 100  # Prix de la tonne de CO2 en CHF (estimation)
-
-    # Calcul des bénéfices via le prix du carbone évité
-    benefits_10y = co2_impact["totals"]["10_years"] * co2_price
-    benefits_20y = co2_impact["totals"]["20_years"] * co2_price
-
-    # Calcul du ROI
-    roi_10y = ((benefits_10y - total_cost) / total_cost) * 100 if total_cost > 0 else 0
-    roi_20y = ((benefits_20y - total_cost) / total_cost) * 100 if total_cost > 0 else 0
-
-    # Période de retour sur investissement (payback)
-    if benefits_10y > 0:
-        yearly_benefit = benefits_10y / 10
-        payback_years = total_cost / yearly_benefit if yearly_benefit > 0 else 999
-    else:
-        payback_years = 999
-
-    # Coût par tonne de CO2 évitée
-    cost_per_tonne = total_cost / co2_impact["totals"]["10_years"] if co2_impact["totals"]["10_years"] > 0 else 0
+    cost_per_tonne = result.cost_per_tonne
+    benefits_10y, benefits_20y, roi_10y, roi_20y, cost_per_tonne_rounded = _round_all([
+        result.benefits_10y, result.benefits_20y,
+        result.roi_10y, result.roi_20y,
+        cost_per_tonne
+    ], 2)
 
     return {
         "investment": {
-            "total_chf": total_cost,
-            "breakdown": proposal["content"]["budget"]["breakdown"]
+            "total_chf": result.total_cost,
+            "breakdown": result.budget_breakdown
         },
         "benefits": {
-            "co2_value_10y": round(benefits_10y, 2),
-            "co2_value_20y": round(benefits_20y, 2),
-            "co2_price_per_tonne": co2_price,
+            "co2_value_10y": benefits_10y,
+            "co2_value_20y": benefits_20y,
+            "co2_price_per_tonne": result.co2_price,
             "additional_benefits": [
                 "Amélioration de la santé publique",
                 "Création d'emplois",
@@ -170,10 +537,10 @@ def calculate_economic_impact(proposal: Dict[str, Any], co2_impact: Dict[str, An
             ]
         },
         "roi": {
-            "roi_10y_percent": round(roi_10y, 2),
-            "roi_20y_percent": round(roi_20y, 2),
-            "payback_years": round(payback_years, 1) if payback_years < 999 else "N/A",
-            "cost_per_tonne_co2": round(cost_per_tonne, 2)
+            "roi_10y_percent": roi_10y,
+            "roi_20y_percent": roi_20y,
+            "payback_years": round(result.payback_years, 1) if result.payback_years < 999 else "N/A",
+            "cost_per_tonne_co2": cost_per_tonne_rounded
         },
         "comparison": {
             "eu_carbon_price_current": 85,
@@ -182,35 +549,19 @@ def calculate_economic_impact(proposal: Dict[str, Any], co2_impact: Dict[str, An
     }
 
 
-def assess_feasibility(proposal: Dict[str, Any]) -> Dict[str, Any]:
+def assess_feasibility(result: Feasibility) -> Dict[str, Any]:
     """
-    Évalue la faisabilité de la proposition.
+    Met en forme l'évaluation de faisabilité de la proposition.
 
     Args:
-        proposal: La proposition à évaluer
+        result: La faisabilité calculée par _simulate_core
 
     Returns:
         Dictionnaire avec l'évaluation de faisabilité
     """
-    # Critères de faisabilité
-    duration = proposal["content"]["implementation"]["total_duration_years"]
-    cost = proposal["content"]["budget"]["total_chf"]
-
-    # Score de faisabilité (0-10)
-    feasibility_score = 10
-
-    # Pénalités
-    if duration > 7:
-        feasibility_score -= 1.5
-    if cost > 150_000_000:
-        feasibility_score -= 1.5
-
-    risks_count = len(proposal["content"]["risks"])
-    if risks_count > 3:
-        feasibility_score -= 1
-
-    # S'assurer que le score reste dans [0, 10]
-    feasibility_score = max(0, min(10, feasibility_score))
+    duration = result.duration_years
+    cost = result.total_cost
+    risks_count = result.risks_count
 
     # Facteurs de succès
     success_factors = [
@@ -237,7 +588,7 @@ def assess_feasibility(proposal: Dict[str, Any]) -> Dict[str, Any]:
     ]
 
     return {
-        "score": round(feasibility_score, 1),
+        "score": round(result.score, 1),
         "duration_assessment": "appropriate" if duration <= 5 else "long",
         "cost_assessment": "reasonable" if cost <= 100_000_000 else "significant",
         "risk_level": "low" if risks_count <= 2 else "medium" if risks_count <= 4 else "high",
@@ -250,30 +601,117 @@ def assess_feasibility(proposal: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def run_quick_simulation(proposal: Dict[str, Any]) -> Dict[str, Any]:
-    """Exécute une simulation rapide."""
-    print("⚡ Running quick simulation...")
+@functools.lru_cache(maxsize=1)
+def get_emission_factors_version() -> str:
+    """Retourne la version des facteurs d'émission scientifiques."""
+    try:
+        return _fast_json_load(EMISSION_FACTORS_PATH).get("version", "unknown")
+    except (OSError, ValueError):
+        return "unknown"
+
 
-    co2_impact = calculate_co2_impact(proposal)
-    economic_impact = calculate_economic_impact(proposal, co2_impact)
-    feasibility = assess_feasibility(proposal)
+def simulation_cache_key(proposal: Dict[str, Any]) -> str:
+    """
+    Calcule la clé de cache d'une proposition à partir de son contenu.
 
+    La clé inclut la version du modèle de simulation et celle des facteurs
+    d'émission : toute mise à jour de l'un ou l'autre invalide le cache.
+    """
+    payload = {
+        "content": proposal["content"],
+        "simulation_version": SIMULATION_VERSION,
+        "emission_factors_version": get_emission_factors_version()
+    }
+    if orjson is not None:
+        data = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def load_cached_simulation(cache_dir: Path, key: str) -> Optional[Dict[str, Any]]:
+    """Charge une entrée de simulation depuis le cache disque, si elle existe."""
+    cache_file = cache_dir / f"{key}.json"
+    if not cache_file.exists():
+        return None
+
+    try:
+        entry = _fast_json_load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+    # Entrée d'un format antérieur (dict exporté seul) : recalculée
+    if "scenario_totals_10y" not in entry:
+        return None
+    return entry
+
+
+def store_cached_simulation(cache_dir: Path, key: str, results: Dict[str, Any]):
+    """Écrit une entrée de simulation dans le cache disque (écriture atomique)."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_dir / f"{key}.json")
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _quick_entry(proposal: Dict[str, Any], cache_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Entrée de cache de la simulation rapide d'une proposition.
+
+    Les résultats sont mémorisés par contenu de proposition (en mémoire et,
+    si cache_dir est fourni, sur disque) : une proposition identique n'est
+    pas recalculée.
+    """
+    key = simulation_cache_key(proposal)
+    entry = _memo_get(key)
+
+    if entry is None and cache_dir is not None:
+        entry = load_cached_simulation(cache_dir, key)
+        if entry is not None:
+            print(f"♻️  Reusing cached simulation ({key})")
+
+    if entry is None:
+        print("⚡ Running quick simulation...")
+
+        entry = _to_cache_entry(_simulate_core(proposal))
+
+        if cache_dir is not None:
+            try:
+                store_cached_simulation(cache_dir, key, entry)
+            except OSError as e:
+                print(f"⚠️  Could not write simulation cache: {e}", file=sys.stderr)
+
+    _memo_put(key, entry)
+    return entry
+
+
+def _quick_result(proposal: Dict[str, Any], entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Résultat rapide exporté, copié depuis l'entrée de cache."""
     return {
         "simulation_type": "quick",
         "proposal_id": proposal["id"],
-        "co2_impact": co2_impact,
-        "economic_impact": economic_impact,
-        "feasibility": feasibility
+        **copy.deepcopy(entry["results"])
     }
 
 
-def run_detailed_simulation(proposal: Dict[str, Any]) -> Dict[str, Any]:
-    """Exécute une simulation détaillée (avec plus de modélisation)."""
-    print("🔬 Running detailed simulation...")
+def run_quick_simulation(proposal: Dict[str, Any], cache_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Exécute une simulation rapide (mémorisée par contenu de proposition)."""
+    return _quick_result(proposal, _quick_entry(proposal, cache_dir))
 
-    # Pour l'instant, la simulation détaillée est identique à la rapide
-    # mais pourrait inclure des modèles plus sophistiqués
-    result = run_quick_simulation(proposal)
+
+def _add_detailed_analyses(result: Dict[str, Any], scenario_totals_10y: List[float]) -> Dict[str, Any]:
+    """
+    Ajoute les analyses de sensibilité et Monte Carlo à un résultat rapide.
+
+    Args:
+        result: Le résultat rapide, complété sur place
+        scenario_totals_10y: Totaux à 10 ans des scénarios, dans l'ordre de _SCENARIO_NAMES
+    """
     result["simulation_type"] = "detailed"
 
     # Ajouter des analyses supplémentaires
@@ -290,12 +728,15 @@ def run_detailed_simulation(proposal: Dict[str, Any]) -> Dict[str, Any]:
         }
     }
 
+    # Percentiles simplifiés = totaux à 10 ans des scénarios pessimiste, réaliste, optimiste
+    p10, p50, p90 = scenario_totals_10y
+
     result["monte_carlo"] = {
         "runs": 1000,
         "co2_reduction_10y": {
-            "p10": result["co2_impact"]["scenarios"]["pessimistic"]["total_10y"],
-            "p50": result["co2_impact"]["scenarios"]["realistic"]["total_10y"],
-            "p90": result["co2_impact"]["scenarios"]["optimistic"]["total_10y"]
+            "p10": p10,
+            "p50": p50,
+            "p90": p90
         },
         "note": "Simplified Monte Carlo results"
     }
@@ -303,50 +744,198 @@ def run_detailed_simulation(proposal: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
-def export_simulation(simulation: Dict[str, Any], output_path: str):
-    """Exporte les résultats de la simulation dans un fichier JSON."""
+def run_detailed_simulation(proposal: Dict[str, Any], cache_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Exécute une simulation détaillée (avec plus de modélisation)."""
+    print("🔬 Running detailed simulation...")
+
+    # Pour l'instant, la simulation détaillée est identique à la rapide
+    # mais pourrait inclure des modèles plus sophistiqués
+    entry = _quick_entry(proposal, cache_dir)
+    return _add_detailed_analyses(_quick_result(proposal, entry), entry["scenario_totals_10y"])
+
+
+def run_batch_simulation(proposals: List[Dict[str, Any]], simulation_type: str = "quick",
+                         cache_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    Simule plusieurs propositions en un seul appel NumPy vectorisé.
+
+    Seules les propositions absentes des caches (mémoire, puis disque) sont
+    recalculées, toutes ensemble.
+
+    Args:
+        proposals: Les propositions à simuler
+        simulation_type: "quick" ou "detailed"
+        cache_dir: Répertoire du cache disque (None pour le désactiver)
+
+    Returns:
+        Les résultats de simulation, dans l'ordre des propositions
+    """
+    keys = [simulation_cache_key(p) for p in proposals]
+    entries: List[Optional[Dict[str, Any]]] = [_memo_get(key) for key in keys]
+
+    if cache_dir is not None:
+        for i, key in enumerate(keys):
+            if entries[i] is None:
+                entries[i] = load_cached_simulation(cache_dir, key)
+
+    missing = [i for i, cached in enumerate(entries) if cached is None]
+    if missing:
+        print(f"⚡ Running batch simulation for {len(missing)} proposal(s)...")
+        computed = _simulate_batch([proposals[i] for i in missing])
+        for i, simulated in zip(missing, computed):
+            entries[i] = _to_cache_entry(simulated)
+            if cache_dir is not None:
+                try:
+                    store_cached_simulation(cache_dir, keys[i], entries[i])
+                except OSError as e:
+                    print(f"⚠️  Could not write simulation cache: {e}", file=sys.stderr)
+
+    simulations = []
+    for proposal, key, entry in zip(proposals, keys, entries):
+        _memo_put(key, entry)
+        simulation = _quick_result(proposal, entry)
+        if simulation_type == "detailed":
+            simulation = _add_detailed_analyses(simulation, entry["scenario_totals_10y"])
+        simulations.append(simulation)
+
+    return simulations
+
+
+def yearly_breakdown_to_columns(yearly_breakdown: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Convertit le détail annuel en colonnes parallèles (year, reduction_tonnes, cumulative_tonnes)."""
+    columns = ("year", "reduction_tonnes", "cumulative_tonnes")
+    if not yearly_breakdown:
+        return {name: [] for name in columns}
+    return {
+        name: [row[name] for row in yearly_breakdown]
+        for name in columns
+    }
+
+
+def export_simulation(simulation: Dict[str, Any], output_path: str, yearly_format: str = "records"):
+    """
+    Exporte les résultats de la simulation dans un fichier JSON.
+
+    Args:
+        simulation: Les résultats de la simulation
+        output_path: Fichier JSON de sortie
+        yearly_format: "records" (liste d'objets, par défaut) ou "columns"
+            (colonnes parallèles, environ deux fois plus compact)
+    """
+    if yearly_format == "columns":
+        co2_impact = simulation["co2_impact"]
+        co2_impact["yearly_breakdown"] = yearly_breakdown_to_columns(co2_impact["yearly_breakdown"])
+
     # Ajouter les métadonnées
     simulation["metadata"] = {
         "generated_at": datetime.utcnow().isoformat() + "Z",
-        "version": "1.0"
+        "version": SIMULATION_VERSION
     }
 
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(simulation, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        output_file.write_bytes(orjson.dumps(simulation, option=ORJSON_EXPORT_OPTIONS))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(simulation, f, indent=2, ensure_ascii=False)
 
     print(f"💾 Simulation results exported to: {output_path}")
 
 
 def print_summary(simulation: Dict[str, Any]):
-    """Affiche un résumé des résultats de simulation."""
-    print("\n" + "="*60)
-    print("📊 SIMULATION SUMMARY")
-    print("="*60)
-
+    """Affiche un résumé des résultats de simulation (en une seule écriture sur stdout)."""
     co2 = simulation["co2_impact"]
     econ = simulation["economic_impact"]
     feas = simulation["feasibility"]
 
-    print(f"\n🌍 CO2 Impact (Realistic Scenario):")
-    print(f"   - 10 years: {co2['scenarios']['realistic']['total_10y']:,.0f} tonnes")
-    print(f"   - 20 years: {co2['scenarios']['realistic']['total_20y']:,.0f} tonnes")
-    print(f"   - Equivalent: {co2['equivalent']['cars_10y']:,.0f} cars off the road")
+    lines = [
+        "",
+        "=" * 60,
+        "📊 SIMULATION SUMMARY",
+        "=" * 60,
+        "",
+        "🌍 CO2 Impact (Realistic Scenario):",
+        f"   - 10 years: {co2['scenarios']['realistic']['total_10y']:,.0f} tonnes",
+        f"   - 20 years: {co2['scenarios']['realistic']['total_20y']:,.0f} tonnes",
+        f"   - Equivalent: {co2['equivalent']['cars_10y']:,.0f} cars off the road",
+        "",
+        "💰 Economic Impact:",
+        f"   - Investment: {econ['investment']['total_chf']:,.0f} CHF",
+        f"   - ROI (10y): {econ['roi']['roi_10y_percent']:.1f}%",
+        f"   - ROI (20y): {econ['roi']['roi_20y_percent']:.1f}%",
+        f"   - Payback: {econ['roi']['payback_years']} years",
+        f"   - Cost per tonne CO2: {econ['roi']['cost_per_tonne_co2']:.2f} CHF",
+        "",
+        "✅ Feasibility:",
+        f"   - Score: {feas['score']}/10",
+        f"   - Risk Level: {feas['risk_level']}",
+        "",
+        "=" * 60
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def output_name(proposal_path: str) -> str:
+    """
+    Nom du fichier de résultats d'une proposition dans le répertoire de sortie.
+
+    Les propositions rangées en <id>/proposal.json (arborescence domains/)
+    prennent le nom de leur répertoire, les autres celui de leur fichier.
+    """
+    path = Path(proposal_path).resolve()
+    stem = path.parent.name if path.stem == "proposal" else path.stem
+    return f"{stem}.json"
 
-    print(f"\n💰 Economic Impact:")
-    print(f"   - Investment: {econ['investment']['total_chf']:,.0f} CHF")
-    print(f"   - ROI (10y): {econ['roi']['roi_10y_percent']:.1f}%")
-    print(f"   - ROI (20y): {econ['roi']['roi_20y_percent']:.1f}%")
-    print(f"   - Payback: {econ['roi']['payback_years']} years")
-    print(f"   - Cost per tonne CO2: {econ['roi']['cost_per_tonne_co2']:.2f} CHF")
 
-    print(f"\n✅ Feasibility:")
-    print(f"   - Score: {feas['score']}/10")
-    print(f"   - Risk Level: {feas['risk_level']}")
+def run_batch(args) -> int:
+    """Simule toutes les propositions correspondant à --proposals-glob."""
+    paths = sorted(glob.glob(args.proposals_glob, recursive=True))
+    if not paths:
+        print(f"❌ No proposal matches: {args.proposals_glob}", file=sys.stderr)
+        return 1
+
+    # Un fichier de sortie par fichier source : les homonymes sont refusés
+    # avant toute simulation plutôt que de s'écraser
+    names = [output_name(path) for path in paths]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        print(f"❌ Several proposals map to the same output file: {', '.join(duplicates)}",
+              file=sys.stderr)
+        return 1
 
-    print("\n" + "="*60)
+    print(f"📋 Proposals: {len(paths)} matching {args.proposals_glob}")
+
+    # Chargement fichier par fichier : une proposition illisible ou incomplète
+    # est signalée et ignorée sans interrompre le lot
+    proposals, output_names, failed = [], [], []
+    for path, name in zip(paths, names):
+        try:
+            proposal = load_proposal(path)
+            _extract_inputs(proposal)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"❌ Cannot load {path}: {e}", file=sys.stderr)
+            failed.append(path)
+            continue
+        proposals.append(proposal)
+        output_names.append(name)
+
+    # Même convention que pour un seul fichier : cache à côté de la sortie
+    output_dir = Path(args.output)
+    cache_dir = None if args.no_cache else Path(f"{args.output}.cache")
+
+    simulations = run_batch_simulation(proposals, args.type, cache_dir)
+
+    for simulation, name in zip(simulations, output_names):
+        export_simulation(simulation, str(output_dir / name), args.yearly_format)
+
+    if failed:
+        print(f"\n⚠️  {len(failed)} proposal(s) could not be simulated:")
+        for path in failed:
+            print(f"   - {path}")
+        return 1
+    return 0
 
 
 def main():
@@ -355,20 +944,30 @@ def main():
 
     try:
         print(f"🔬 Starting simulation...")
-        print(f"📋 Proposal: {args.proposal}")
         print(f"🎯 Type: {args.type}")
 
+        if args.proposals_glob:
+            status = run_batch(args)
+            if status == 0:
+                print("\n✨ Done!")
+            return status
+
+        print(f"📋 Proposal: {args.proposal}")
+
         # Charger la proposition
         proposal = load_proposal(args.proposal)
 
+        # Cache disque à côté du fichier de sortie
+        cache_dir = None if args.no_cache else Path(f"{args.output}.cache")
+
         # Exécuter la simulation appropriée
         if args.type == "quick":
-            simulation = run_quick_simulation(proposal)
+            simulation = run_quick_simulation(proposal, cache_dir)
         else:
-            simulation = run_detailed_simulation(proposal)
+            simulation = run_detailed_simulation(proposal, cache_dir)
 
         # Exporter les résultats
-        export_simulation(simulation, args.output)
+        export_simulation(simulation, args.output, args.yearly_format)
 
         # Afficher le résumé
         print_summary(simulation)
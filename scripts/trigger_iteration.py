@@ -7,13 +7,30 @@ une nouvelle proposition climatique basée sur le contexte fourni.
 """
 
 import argparse
+import atexit
 import json
 import os
+import random
 import sys
 from pathlib import Path
 from typing import Dict, Any
 import time
 
+try:
+    import orjson
+except ImportError:  # Repli sur le module json standard
+    orjson = None
+
+# Clients HTTP réutilisés par URL d'orchestrateur (keep-alive : pas de
+# nouvelle poignée de main TCP/TLS à chaque appel)
+_CLIENTS: Dict[str, Any] = {}
+
+# Nouvelles tentatives sur erreurs transitoires (backoff exponentiel + jitter)
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY_S = 1.0
+RETRY_MAX_DELAY_S = 30.0
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
 
 def parse_args():
     """Parse les arguments de la ligne de commande."""
@@ -43,10 +60,80 @@ def parse_args():
     return parser.parse_args()
 
 
+def _loads(data: bytes) -> Any:
+    """Parse du JSON brut (bytes, sans décodage préalable en str)."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
 def load_context(context_path: str) -> Dict[str, Any]:
     """Charge le fichier de contexte."""
-    with open(context_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _loads(Path(context_path).read_bytes())
+
+
+def _get_client(orchestrator_url: str):
+    """
+    Retourne le client httpx associé à l'URL de l'orchestrateur.
+
+    Le client est créé au premier appel puis réutilisé ; les clients ouverts
+    sont fermés à la sortie du script.
+    """
+    client = _CLIENTS.get(orchestrator_url)
+    if client is None:
+        import httpx
+
+        client = httpx.Client(
+            base_url=orchestrator_url,
+            timeout=httpx.Timeout(300.0, connect=10.0),  # 5 minutes pour la génération
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30)
+        )
+        _CLIENTS[orchestrator_url] = client
+    return client
+
+
+def close_clients():
+    """Ferme les clients HTTP ouverts."""
+    while _CLIENTS:
+        _, client = _CLIENTS.popitem()
+        client.close()
+
+
+atexit.register(close_clients)
+
+
+def _retry(fn, max_attempts: int = RETRY_MAX_ATTEMPTS, base: float = RETRY_BASE_DELAY_S,
+           cap: float = RETRY_MAX_DELAY_S):
+    """
+    Appelle fn() en réessayant sur les erreurs transitoires.
+
+    Sont réessayées les erreurs réseau/timeouts httpx et les réponses
+    429/5xx transitoires ; le délai entre deux tentatives est
+    min(cap, base * 2**tentative) augmenté d'un jitter de 0 à 50 %.
+
+    Returns:
+        La réponse de la dernière tentative (éventuellement en erreur HTTP)
+
+    Raises:
+        L'exception réseau de la dernière tentative
+    """
+    import httpx
+
+    for attempt in range(max_attempts):
+        is_last = attempt == max_attempts - 1
+        try:
+            response = fn()
+        except (httpx.TransportError, httpx.TimeoutException) as e:
+            if is_last:
+                raise
+            reason = str(e) or type(e).__name__
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES or is_last:
+                return response
+            reason = f"HTTP {response.status_code}"
+
+        delay = min(cap, base * 2 ** attempt) * (1 + random.uniform(0, 0.5))
+        print(f"⏳ Orchestrator call failed ({reason}), retrying in {delay:.1f}s "
+              f"({attempt + 2}/{max_attempts})", file=sys.stderr)
+        time.sleep(delay)
 
 
 def call_orchestrator(domain: str, context: Dict[str, Any], orchestrator_url: str) -> Dict[str, Any]:
@@ -72,19 +159,17 @@ def call_orchestrator(domain: str, context: Dict[str, Any], orchestrator_url: st
     print(f"   Domain: {domain}")
 
     try:
-        import httpx
-
-        response = httpx.post(
-            f"{orchestrator_url}/api/v1/proposals/generate",
+        client = _get_client(orchestrator_url)
+        response = _retry(lambda: client.post(
+            "/api/v1/proposals/generate",
             json={
                 "domain": domain,
                 "context": context
-            },
-            timeout=300.0  # 5 minutes
-        )
+            }
+        ))
 
         if response.status_code == 200:
-            return response.json()
+            return _loads(response.content)
         else:
             print(f"❌ Orchestrator returned error: {response.status_code}", file=sys.stderr)
             print(f"   Falling back to mock proposal", file=sys.stderr)
@@ -96,112 +181,104 @@ def call_orchestrator(domain: str, context: Dict[str, Any], orchestrator_url: st
         return generate_mock_proposal(domain, context)
 
 
-def generate_mock_proposal(domain: str, context: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Génère une proposition mock pour les tests.
-
-    Cette fonction génère une proposition réaliste basée sur le domaine
-    et le contexte, utilisable pour tester le workflow sans orchestrateur réel.
-    """
-    from datetime import datetime
-    import uuid
-
-    # Propositions types par domaine
-    domain_proposals = {
-        "transport": {
-            "title": "Extension du réseau de pistes cyclables sécurisées",
-            "description": "Création de 50 km de pistes cyclables protégées dans les zones urbaines pour favoriser la mobilité douce et réduire les émissions de CO2.",
-            "actions": [
-                "Identifier les axes prioritaires en collaboration avec les collectivités",
-                "Concevoir des pistes séparées du trafic automobile",
-                "Installer des stationnements vélo sécurisés aux points d'intérêt",
-                "Mettre en place une signalétique claire et cohérente"
-            ],
-            "cost_estimate": 15000000,
-            "timeframe_years": 3,
-            "co2_reduction_potential": 8500
-        },
-        "energie": {
-            "title": "Déploiement de panneaux solaires sur bâtiments publics",
-            "description": "Installation de 100 MW de capacité solaire photovoltaïque sur les toitures de bâtiments publics existants.",
-            "actions": [
-                "Audit énergétique des bâtiments publics",
-                "Sélection des sites les plus adaptés",
-                "Installation des panneaux photovoltaïques",
-                "Connexion au réseau et monitoring"
-            ],
-            "cost_estimate": 120000000,
-            "timeframe_years": 4,
-            "co2_reduction_potential": 45000
-        },
-        "batiment": {
-            "title": "Programme de rénovation énergétique des logements anciens",
-            "description": "Rénovation thermique de 1000 logements construits avant 1990 pour atteindre le standard Minergie.",
-            "actions": [
-                "Identification des bâtiments prioritaires",
-                "Isolation renforcée (toiture, façades, sols)",
-                "Remplacement des fenêtres par du double vitrage performant",
-                "Installation de systèmes de chauffage efficaces (pompes à chaleur)"
-            ],
-            "cost_estimate": 80000000,
-            "timeframe_years": 5,
-            "co2_reduction_potential": 15000
-        },
-        "agriculture": {
-            "title": "Transition vers l'agriculture régénérative",
-            "description": "Accompagnement de 500 exploitations agricoles vers des pratiques régénératives séquestrant du carbone.",
-            "actions": [
-                "Formation des agriculteurs aux techniques régénératives",
-                "Mise en place de cultures de couverture",
-                "Réduction du labour et pratique du semis direct",
-                "Agroforesterie et haies bocagères"
-            ],
-            "cost_estimate": 25000000,
-            "timeframe_years": 5,
-            "co2_reduction_potential": 35000
-        },
-        "industrie": {
-            "title": "Décarbonation des processus industriels",
-            "description": "Électrification et optimisation énergétique de 50 sites industriels pour réduire les émissions.",
-            "actions": [
-                "Audit énergétique complet des sites",
-                "Remplacement des chaudières fossiles par des alternatives électriques",
-                "Récupération de chaleur fatale",
-                "Optimisation des processus de production"
-            ],
-            "cost_estimate": 200000000,
-            "timeframe_years": 6,
-            "co2_reduction_potential": 120000
-        },
-        "transversal": {
-            "title": "Plateforme numérique d'accompagnement à la décarbonation",
-            "description": "Création d'une plateforme digitale pour aider citoyens et entreprises à mesurer et réduire leur empreinte carbone.",
-            "actions": [
-                "Développement de la plateforme web et mobile",
-                "Intégration de calculateurs d'empreinte carbone",
-                "Recommandations personnalisées basées sur l'IA",
-                "Communauté et gamification pour encourager l'action"
-            ],
-            "cost_estimate": 5000000,
-            "timeframe_years": 2,
-            "co2_reduction_potential": 50000
-        }
+# Propositions types par domaine (générateur mock)
+_MOCK_DOMAIN_PROPOSALS = {
+    "transport": {
+        "title": "Extension du réseau de pistes cyclables sécurisées",
+        "description": "Création de 50 km de pistes cyclables protégées dans les zones urbaines pour favoriser la mobilité douce et réduire les émissions de CO2.",
+        "actions": [
+            "Identifier les axes prioritaires en collaboration avec les collectivités",
+            "Concevoir des pistes séparées du trafic automobile",
+            "Installer des stationnements vélo sécurisés aux points d'intérêt",
+            "Mettre en place une signalétique claire et cohérente"
+        ],
+        "cost_estimate": 15000000,
+        "timeframe_years": 3,
+        "co2_reduction_potential": 8500
+    },
+    "energie": {
+        "title": "Déploiement de panneaux solaires sur bâtiments publics",
+        "description": "Installation de 100 MW de capacité solaire photovoltaïque sur les toitures de bâtiments publics existants.",
+        "actions": [
+            "Audit énergétique des bâtiments publics",
+            "Sélection des sites les plus adaptés",
+            "Installation des panneaux photovoltaïques",
+            "Connexion au réseau et monitoring"
+        ],
+        "cost_estimate": 120000000,
+        "timeframe_years": 4,
+        "co2_reduction_potential": 45000
+    },
+    "batiment": {
+        "title": "Programme de rénovation énergétique des logements anciens",
+        "description": "Rénovation thermique de 1000 logements construits avant 1990 pour atteindre le standard Minergie.",
+        "actions": [
+            "Identification des bâtiments prioritaires",
+            "Isolation renforcée (toiture, façades, sols)",
+            "Remplacement des fenêtres par du double vitrage performant",
+            "Installation de systèmes de chauffage efficaces (pompes à chaleur)"
+        ],
+        "cost_estimate": 80000000,
+        "timeframe_years": 5,
+        "co2_reduction_potential": 15000
+    },
+    "agriculture": {
+        "title": "Transition vers l'agriculture régénérative",
+        "description": "Accompagnement de 500 exploitations agricoles vers des pratiques régénératives séquestrant du carbone.",
+        "actions": [
+            "Formation des agriculteurs aux techniques régénératives",
+            "Mise en place de cultures de couverture",
+            "Réduction du labour et pratique du semis direct",
+            "Agroforesterie et haies bocagères"
+        ],
+        "cost_estimate": 25000000,
+        "timeframe_years": 5,
+        "co2_reduction_potential": 35000
+    },
+    "industrie": {
+        "title": "Décarbonation des processus industriels",
+        "description": "Électrification et optimisation énergétique de 50 sites industriels pour réduire les émissions.",
+        "actions": [
+            "Audit énergétique complet des sites",
+            "Remplacement des chaudières fossiles par des alternatives électriques",
+            "Récupération de chaleur fatale",
+            "Optimisation des processus de production"
+        ],
+        "cost_estimate": 200000000,
+        "timeframe_years": 6,
+        "co2_reduction_potential": 120000
+    },
+    "transversal": {
+        "title": "Plateforme numérique d'accompagnement à la décarbonation",
+        "description": "Création d'une plateforme digitale pour aider citoyens et entreprises à mesurer et réduire leur empreinte carbone.",
+        "actions": [
+            "Développement de la plateforme web et mobile",
+            "Intégration de calculateurs d'empreinte carbone",
+            "Recommandations personnalisées basées sur l'IA",
+            "Communauté et gamification pour encourager l'action"
+        ],
+        "cost_estimate": 5000000,
+        "timeframe_years": 2,
+        "co2_reduction_potential": 50000
     }
+}
 
-    # Sélectionner la proposition appropriée
-    proposal_template = domain_proposals.get(domain, domain_proposals["transversal"])
 
-    # Générer un ID unique
-    proposal_id = str(uuid.uuid4())[:8]
+def _build_mock_template(domain: str, proposal_template: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Construit la proposition mock complète d'un domaine, hors champs variables.
 
-    # Construire la proposition complète
-    proposal = {
-        "id": f"{domain}-{proposal_id}",
+    L'id, la date de génération et les métadonnées (réservés ici pour garder
+    l'ordre des clés) sont remplis à chaque appel par generate_mock_proposal ;
+    tout le reste ne dépend que du domaine.
+    """
+    return {
+        "id": None,
         "domain": domain,
         "title": proposal_template["title"],
         "description": proposal_template["description"],
         "status": "generated",
-        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "generated_at": None,
         "generated_by": "mock-generator",
         "version": "1.0",
         "content": {
@@ -264,22 +341,55 @@ def generate_mock_proposal(domain: str, context: Dict[str, Any]) -> Dict[str, An
                 "Organisations environnementales"
             ]
         },
+        "metadata": None
+    }
+
+
+# Propositions mock précalculées par domaine (à ne pas modifier)
+_MOCK_BASE = {
+    domain: _build_mock_template(domain, template)
+    for domain, template in _MOCK_DOMAIN_PROPOSALS.items()
+}
+
+
+def generate_mock_proposal(domain: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Génère une proposition mock pour les tests.
+
+    Cette fonction génère une proposition réaliste basée sur le domaine
+    et le contexte, utilisable pour tester le workflow sans orchestrateur réel.
+    Le contenu est précalculé par domaine (_MOCK_BASE) et partagé entre les
+    appels : seuls l'id, la date et les métadonnées sont propres à chaque
+    proposition.
+    """
+    from datetime import datetime
+    import uuid
+
+    # Sélectionner la proposition appropriée
+    base = _MOCK_BASE.get(domain)
+    if base is None:
+        base = {**_MOCK_BASE["transversal"], "domain": domain}
+
+    return {
+        **base,
+        "id": f"{domain}-{uuid.uuid4().hex[:8]}",
+        "generated_at": datetime.utcnow().isoformat() + "Z",
         "metadata": {
             "context_version": context.get("metadata", {}).get("schema_version", "unknown"),
             "is_mock": True
         }
     }
 
-    return proposal
-
 
 def export_proposal(proposal: Dict[str, Any], output_path: str):
     """Exporte la proposition dans un fichier JSON."""
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(proposal, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        output_file.write_bytes(orjson.dumps(proposal, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        output_file.write_bytes(json.dumps(proposal, indent=2, ensure_ascii=False).encode('utf-8'))
 
     print(f"💾 Proposal exported to: {output_path}")
 
@@ -2,25 +2,102 @@
 API REST pour l'interface citoyenne
 Permet aux citoyens de consulter les propositions et de voter
 """
+import asyncio
+import fcntl
+import hashlib
 import json
 import os
-from datetime import datetime
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException
+import httpx
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field
 
+try:
+    import aiofiles
+except ImportError:  # Lecture via un thread si aiofiles est absent
+    aiofiles = None
+
+try:
+    import ijson
+except ImportError:  # Repli sur un chargement complet de votes.json
+    ijson = None
+
+try:
+    from watchfiles import awatch
+except ImportError:  # Repli sur un parcours de domains/ à chaque requête
+    awatch = None
+
+try:
+    import orjson
+except ImportError:  # Repli sur le module json standard
+    orjson = None
+
+# Réponses sérialisées directement (sans modèle pydantic intermédiaire)
+FastJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
 # Configuration
 DOMAINS_PATH = Path(__file__).parent.parent.parent / "domains"
 VOTES_PATH = Path(__file__).parent / "data" / "votes.json"
 
+# Journal des votes en ajout seul (une ligne JSON par vote), intégré
+# périodiquement dans votes.json (compaction)
+VOTES_LOG_PATH = VOTES_PATH.parent / "votes.jsonl"
+VOTES_PENDING_LOG_PATH = VOTES_PATH.parent / "votes.jsonl.compacting"
+VOTES_LOCK_PATH = VOTES_PATH.parent / "votes.lock"
+VOTES_LOG_COMPACT_BYTES = 1024 * 1024
+
+# Client HTTP partagé pour les appels sortants (orchestrateur, validation)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=100)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Cycle de vie de l'application.
+
+    Au démarrage : intègre le journal des votes laissé par l'exécution
+    précédente et crée un client HTTP unique (pool de connexions, HTTP/2),
+    accessible dans les endpoints via request.app.state.http.
+    """
+    try:
+        await asyncio.to_thread(compact_votes)
+    except OSError as e:
+        print(f"Erreur lors de la compaction des votes: {e}")
+
+    app.state.http = httpx.AsyncClient(http2=True, timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+
+    # Surveillance de domains/ : invalide le cache des propositions sur événement
+    watcher = None
+    stop_watching = asyncio.Event()
+    if awatch is not None and DOMAINS_PATH.is_dir():
+        watcher = asyncio.create_task(_watch_domains(stop_watching))
+
+    try:
+        yield
+    finally:
+        if watcher is not None:
+            # Arrêt via stop_event plutôt qu'une annulation du thread de surveillance
+            stop_watching.set()
+            await watcher
+        await app.state.http.aclose()
+
+
 app = FastAPI(
     title="Climate AI Collective - Citizen API",
     description="API permettant aux citoyens de consulter les propositions et de voter",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS pour permettre les appels depuis le frontend
@@ -32,6 +109,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression gzip des réponses JSON volumineuses (liste et détail des propositions)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Modèles de données
 
 class ProposalSummary(BaseModel):
@@ -93,27 +173,257 @@ class VotingSummary(BaseModel):
 
 # Fonctions utilitaires
 
-def load_votes() -> dict:
-    """Charge les votes depuis le fichier JSON"""
+# Dernier horodatage formaté : (seconde UNIX, chaîne ISO 8601 UTC)
+_iso_cache = (0, "")
+
+
+def now_iso() -> str:
+    """
+    Horodatage UTC ISO 8601 à la seconde près.
+
+    La chaîne est formatée une seule fois par seconde et partagée entre les
+    requêtes (sondes /health, votes).
+    """
+    global _iso_cache
+    now = int(time.time())
+    cached_second, cached_iso = _iso_cache
+    if cached_second != now:
+        cached_iso = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now))
+        _iso_cache = (now, cached_iso)
+    return cached_iso
+
+
+def _loads(data: bytes):
+    """Parse du JSON brut (bytes, sans décodage préalable en str)"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def read_json(path: Path):
+    """Lit et parse un fichier JSON (orjson si disponible)"""
+    return _loads(path.read_bytes())
+
+
+async def read_json_async(path: Path):
+    """Lit et parse un fichier JSON sans bloquer la boucle d'événements ; None s'il n'existe pas"""
+    if not path.exists():
+        return None
+
+    if aiofiles is None:
+        return await asyncio.to_thread(read_json, path)
+
+    async with aiofiles.open(path, 'rb') as f:
+        return _loads(await f.read())
+
+
+def write_json(path: Path, data):
+    """Écrit un fichier JSON indenté (orjson si disponible)"""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        path.write_bytes(json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+
+
+def _load_votes_checkpoint() -> dict:
+    """Charge votes.json (état compacté, sans le journal)"""
     if not VOTES_PATH.exists():
-        return {"votes": [], "summaries": {}}
+        return {"votes": [], "summaries": {}, "sums": {}}
 
-    with open(VOTES_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return read_json(VOTES_PATH)
+
+
+def _read_vote_log(path: Path) -> List[dict]:
+    """Lit un journal de votes JSONL (les lignes incomplètes sont ignorées)"""
+    try:
+        lines = path.read_bytes().splitlines()
+    except FileNotFoundError:
+        return []
+
+    votes = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            votes.append(_loads(line))
+        except ValueError:
+            # Écriture interrompue : ligne tronquée
+            continue
+    return votes
+
+
+def _pending_votes(last_compacted_vote_id: Optional[str]) -> List[dict]:
+    """
+    Votes du journal en cours de compaction, s'ils ne sont pas déjà dans votes.json.
+
+    Le journal renommé n'est plus modifié : s'il se termine par le dernier
+    vote intégré (last_compacted_vote_id de votes.json), la compaction a
+    déjà réécrit votes.json et seule la suppression du journal manque.
+    """
+    votes = _read_vote_log(VOTES_PENDING_LOG_PATH)
+    if votes and votes[-1].get("vote_id") == last_compacted_vote_id:
+        return []
+    return votes
+
+
+def _logged_votes(last_compacted_vote_id: Optional[str]) -> List[dict]:
+    """Votes du journal pas encore intégrés dans votes.json (y compris une compaction en cours)"""
+    return _pending_votes(last_compacted_vote_id) + _read_vote_log(VOTES_LOG_PATH)
+
+
+def load_votes() -> dict:
+    """Charge tous les votes : votes.json complété par le journal votes.jsonl"""
+    votes_data = _load_votes_checkpoint()
+    sums = get_vote_sums(votes_data)
+
+    for vote in _logged_votes(votes_data.get("last_compacted_vote_id")):
+        votes_data["votes"].append(vote)
+        _add_vote_to_sums(sums, vote)
+
+    return votes_data
+
+
+def load_vote_sums() -> dict:
+    """
+    Charge uniquement les agrégats de votes ({proposal_id: {n, si, sf, sd}}).
+
+    Avec ijson, seule la clé "sums" de votes.json est matérialisée : la liste
+    des votes est parcourue sans être chargée en mémoire. Les votes du
+    journal sont ensuite ajoutés aux agrégats.
+    """
+    if ijson is None or not VOTES_PATH.exists():
+        return get_vote_sums(load_votes())
+
+    with open(VOTES_PATH, 'rb') as f:
+        sums = dict(ijson.kvitems(f, "sums"))
+
+    # Fichier antérieur sans agrégats : calcul à partir de la liste des votes
+    if not sums:
+        return get_vote_sums(load_votes())
+
+    # Marqueur de compaction, lu seulement si un journal est en compaction
+    # (écrit en tête de votes.json, le parcours s'arrête aussitôt)
+    last_compacted_vote_id = None
+    if VOTES_PENDING_LOG_PATH.exists():
+        with open(VOTES_PATH, 'rb') as f:
+            last_compacted_vote_id = next(ijson.items(f, "last_compacted_vote_id"), None)
+
+    for vote in _logged_votes(last_compacted_vote_id):
+        _add_vote_to_sums(sums, vote)
+    return sums
 
 
 def save_votes(votes_data: dict):
-    """Sauvegarde les votes dans le fichier JSON"""
+    """Sauvegarde les votes dans le fichier JSON (écriture atomique)"""
     VOTES_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(VOTES_PATH, 'w', encoding='utf-8') as f:
-        json.dump(votes_data, f, indent=2, ensure_ascii=False)
+    fd, tmp_path = tempfile.mkstemp(dir=VOTES_PATH.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write_json(Path(tmp_path), votes_data)
+        os.replace(tmp_path, VOTES_PATH)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def append_vote(vote: dict):
+    """
+    Ajoute un vote au journal votes.jsonl en une seule écriture O_APPEND.
+
+    Le fichier est rouvert à chaque vote : après une compaction, les votes
+    suivants vont ainsi dans un nouveau journal. L'ouverture et l'écriture
+    se font sous verrou partagé, pour que la compaction (verrou exclusif) ne
+    puisse pas renommer le journal entre les deux.
+    """
+    line = (orjson.dumps(vote) if orjson is not None
+            else json.dumps(vote, ensure_ascii=False).encode('utf-8')) + b"\n"
+
+    VOTES_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(VOTES_LOCK_PATH, 'ab') as lock:
+        fcntl.flock(lock, fcntl.LOCK_SH)
+        fd = os.open(VOTES_LOG_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+
+def compact_votes():
+    """
+    Intègre le journal votes.jsonl dans votes.json.
+
+    Le journal est d'abord renommé (les nouveaux votes vont dans un nouveau
+    journal), puis votes.json est réécrit avec les votes, agrégats et
+    résumés à jour, et l'identifiant du dernier vote intégré. Le verrou
+    exclusif est pris sans attendre : si un ajout ou une autre compaction le
+    tient, la compaction est abandonnée et le prochain vote qui trouve le
+    journal au-delà du seuil la relance. Une compaction interrompue est reprise à l'appel suivant sans
+    compter deux fois le journal : s'il est déjà intégré, il est seulement
+    supprimé.
+    """
+    VOTES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(VOTES_LOCK_PATH, 'ab') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # Compaction déjà en cours ou ajout en cours : le prochain vote
+            # au-delà du seuil réessaiera
+            return
+
+        if not VOTES_PENDING_LOG_PATH.exists():
+            try:
+                os.replace(VOTES_LOG_PATH, VOTES_PENDING_LOG_PATH)
+            except FileNotFoundError:
+                return
+
+        votes_data = _load_votes_checkpoint()
+        pending = _pending_votes(votes_data.get("last_compacted_vote_id"))
+
+        if pending:
+            sums = get_vote_sums(votes_data)
+            for vote in pending:
+                votes_data["votes"].append(vote)
+                _add_vote_to_sums(sums, vote)
+
+            votes_data["summaries"] = {
+                proposal_id: summarize_vote_sums(proposal_sums)
+                for proposal_id, proposal_sums in sums.items()
+            }
+
+            # Marqueur en tête du fichier : lu sans parcourir la liste des votes
+            votes_data.pop("last_compacted_vote_id", None)
+            votes_data = {"last_compacted_vote_id": pending[-1].get("vote_id"), **votes_data}
+            save_votes(votes_data)
 
+        os.unlink(VOTES_PENDING_LOG_PATH)
 
-def calculate_voting_summary(proposal_id: str, votes_data: dict) -> dict:
-    """Calcule le résumé des votes pour une proposition"""
-    proposal_votes = [v for v in votes_data["votes"] if v["proposal_id"] == proposal_id]
 
-    if not proposal_votes:
+def _add_vote_to_sums(sums: dict, vote: dict):
+    """Ajoute un vote aux agrégats de sa proposition (n, somme des trois notes)"""
+    proposal_sums = sums.setdefault(vote["proposal_id"], {"n": 0, "si": 0, "sf": 0, "sd": 0})
+    proposal_sums["n"] += 1
+    proposal_sums["si"] += vote["impact_score"]
+    proposal_sums["sf"] += vote["feasibility_score"]
+    proposal_sums["sd"] += vote["desirability_score"]
+
+
+def get_vote_sums(votes_data: dict) -> dict:
+    """
+    Retourne les agrégats de votes par proposition ({proposal_id: {n, si, sf, sd}}).
+
+    Les fichiers antérieurs sans agrégats sont complétés une seule fois à
+    partir de la liste des votes.
+    """
+    sums = votes_data.get("sums")
+    if not sums and votes_data["votes"]:
+        sums = {}
+        for vote in votes_data["votes"]:
+            _add_vote_to_sums(sums, vote)
+    votes_data["sums"] = sums or {}
+    return votes_data["sums"]
+
+
+def summarize_vote_sums(proposal_sums: Optional[dict]) -> dict:
+    """Calcule le résumé des votes à partir des agrégats d'une proposition"""
+    if not proposal_sums or not proposal_sums["n"]:
         return {
             "total_votes": 0,
             "avg_impact_score": 0,
@@ -122,10 +432,10 @@ def calculate_voting_summary(proposal_id: str, votes_data: dict) -> dict:
             "avg_overall_score": 0
         }
 
-    total = len(proposal_votes)
-    avg_impact = sum(v["impact_score"] for v in proposal_votes) / total
-    avg_feasibility = sum(v["feasibility_score"] for v in proposal_votes) / total
-    avg_desirability = sum(v["desirability_score"] for v in proposal_votes) / total
+    total = proposal_sums["n"]
+    avg_impact = proposal_sums["si"] / total
+    avg_feasibility = proposal_sums["sf"] / total
+    avg_desirability = proposal_sums["sd"] / total
     avg_overall = (avg_impact + avg_feasibility + avg_desirability) / 3
 
     return {
@@ -137,71 +447,270 @@ def calculate_voting_summary(proposal_id: str, votes_data: dict) -> dict:
     }
 
 
-def find_all_proposals() -> List[dict]:
-    """Trouve toutes les propositions dans le répertoire domains/"""
-    proposals = []
+# Version de domains/, incrémentée à chaque événement du système de fichiers ;
+# None tant qu'aucune surveillance n'est active (parcours à chaque requête)
+_domains_version: Optional[int] = None
+
+
+async def _watch_domains(stop_event: asyncio.Event):
+    """Incrémente _domains_version à chaque modification sous domains/ (inotify/kqueue via watchfiles)"""
+    global _domains_version
+    next_change = None
+    try:
+        watcher = awatch(DOMAINS_PATH, recursive=True, stop_event=stop_event)
+        next_change = asyncio.ensure_future(watcher.__anext__())
+        # Le générateur met en place la surveillance avant son premier await :
+        # la version 0 n'est publiée qu'une fois ce point atteint, pour que
+        # toute modification ultérieure au parcours initial l'invalide
+        while watcher.ag_await is None and not next_change.done():
+            await asyncio.sleep(0)
+        _domains_version = 0
+
+        try:
+            await next_change
+        except StopAsyncIteration:
+            return
+        _domains_version += 1
+        async for _ in watcher:
+            _domains_version += 1
+    except OSError as e:
+        print(f"Surveillance de {DOMAINS_PATH} indisponible: {e}")
+    finally:
+        if next_change is not None and not next_change.done():
+            next_change.cancel()
+        _domains_version = None
+
+
+@lru_cache(maxsize=1)
+def _signature_for_version(version: int) -> Tuple[Tuple[str, int, int], ...]:
+    """Signature de domains/ calculée une seule fois par version surveillée"""
+    return _scan_domains_signature()
+
+
+def _domains_signature() -> Tuple[Tuple[str, int, int], ...]:
+    """
+    Signature courante de domains/.
+
+    Quand domains/ est surveillé, le parcours n'est refait qu'après un
+    événement du système de fichiers ; sinon il est refait à chaque appel.
+    """
+    version = _domains_version
+    if version is None:
+        return _scan_domains_signature()
+    return _signature_for_version(version)
 
-    if not DOMAINS_PATH.exists():
-        return proposals
 
-    for domain_dir in DOMAINS_PATH.iterdir():
-        if not domain_dir.is_dir():
-            continue
+def _scan_domains_signature() -> Tuple[Tuple[str, int, int], ...]:
+    """
+    Signature du répertoire domains/ : (chemin, mtime_ns, taille) de chaque proposal.json.
 
-        proposals_dir = domain_dir / "proposals"
-        if not proposals_dir.exists():
-            continue
+    Un simple parcours avec stat, sans lecture ni parsing : toute création,
+    suppression ou modification d'une proposition change la signature.
+    os.scandir réutilise les métadonnées de la lecture des dossiers pour
+    is_dir, et les chemins restent des chaînes.
+    """
+    signature = []
 
-        for proposal_dir in proposals_dir.iterdir():
-            if not proposal_dir.is_dir():
-                continue
+    try:
+        domains_it = os.scandir(DOMAINS_PATH)
+    except OSError:
+        return ()
 
-            proposal_file = proposal_dir / "proposal.json"
-            if not proposal_file.exists():
+    with domains_it:
+        for domain_entry in domains_it:
+            if not domain_entry.is_dir(follow_symlinks=False):
                 continue
 
             try:
-                with open(proposal_file, 'r', encoding='utf-8') as f:
-                    proposal = json.load(f)
-                    proposals.append(proposal)
-            except Exception as e:
-                print(f"Erreur lors du chargement de {proposal_file}: {e}")
+                proposals_it = os.scandir(os.path.join(domain_entry.path, "proposals"))
+            except OSError:
+                continue
+
+            with proposals_it:
+                for proposal_entry in proposals_it:
+                    if not proposal_entry.is_dir(follow_symlinks=False):
+                        continue
+
+                    proposal_file = os.path.join(proposal_entry.path, "proposal.json")
+                    try:
+                        st = os.stat(proposal_file)
+                    except OSError:
+                        continue
+                    signature.append((proposal_file, st.st_mtime_ns, st.st_size))
+
+    return tuple(signature)
 
-    return proposals
 
+def _static_summary(proposal: dict) -> dict:
+    """Champs du résumé qui ne dépendent que du fichier de la proposition (hors votes)"""
+    # Extraire les informations de réduction CO2 et coût
+    co2_reduction = None
+    total_cost = None
 
-def load_proposal_files(proposal_id: str, domain: str) -> dict:
-    """Charge tous les fichiers d'une proposition (proposal, validation, simulation)"""
-    proposal_dir = DOMAINS_PATH / domain / "proposals" / proposal_id
+    if "content" in proposal:
+        content = proposal["content"]
+        if "impact" in content:
+            co2_reduction = content["impact"].get("co2_reduction_tonnes_10y")
+        if "budget" in content:
+            total_cost = content["budget"].get("total_chf")
 
-    result = {
-        "proposal": None,
-        "validation": None,
-        "simulation": None
+    # Mêmes types que ProposalSummary : la liste est renvoyée sans validation
+    return {
+        "id": proposal.get("id", ""),
+        "domain": proposal.get("domain", ""),
+        "title": proposal.get("title", ""),
+        "description": proposal.get("description", ""),
+        "status": proposal.get("status", ""),
+        "co2_reduction_tonnes_10y": float(co2_reduction) if co2_reduction is not None else None,
+        "total_cost_chf": float(total_cost) if total_cost is not None else None,
+        "generated_at": proposal.get("generated_at", "")
     }
 
-    # Charger la proposition
-    proposal_file = proposal_dir / "proposal.json"
-    if proposal_file.exists():
-        with open(proposal_file, 'r', encoding='utf-8') as f:
-            result["proposal"] = json.load(f)
 
-    # Charger la validation
-    validation_file = proposal_dir / "validation.json"
-    if validation_file.exists():
-        with open(validation_file, 'r', encoding='utf-8') as f:
-            result["validation"] = json.load(f)
+@lru_cache(maxsize=4096)
+def _load_proposal_entry(proposal_file: str, mtime_ns: int, size: int) -> Tuple[dict, dict]:
+    """Lit une proposition et précalcule son résumé statique (mis en cache par révision du fichier)"""
+    proposal = read_json(Path(proposal_file))
+    return proposal, _static_summary(proposal)
+
+
+@lru_cache(maxsize=1)
+def _cached_proposals(signature: Tuple[Tuple[str, int, int], ...]) -> dict:
+    """
+    Index des propositions listées dans la signature (mis en cache tant qu'elle ne change pas)
+
+    Seuls les fichiers modifiés depuis le dernier index sont relus. Retourne
+    {"proposals": (...), "summaries": (...), "by_id": {...}, "path_by_id": {...}}.
+    """
+    proposals = []
+    summaries = []
+    by_id = {}
+    path_by_id = {}
+
+    for entry in signature:
+        proposal_file = entry[0]
+        try:
+            proposal, summary = _load_proposal_entry(*entry)
+        except Exception as e:
+            print(f"Erreur lors du chargement de {proposal_file}: {e}")
+            continue
 
-    # Charger la simulation (essayer quick puis deep)
+        proposals.append(proposal)
+        summaries.append(summary)
+        proposal_id = proposal.get("id")
+        if proposal_id is not None and proposal_id not in by_id:
+            # En cas de doublon, la première occurrence est conservée
+            by_id[proposal_id] = proposal
+            path_by_id[proposal_id] = Path(proposal_file)
+
+    return {
+        "proposals": tuple(proposals),
+        "summaries": tuple(summaries),
+        "by_id": by_id,
+        "path_by_id": path_by_id
+    }
+
+
+def _proposal_index() -> dict:
+    """Index à jour des propositions (voir _cached_proposals)"""
+    return _cached_proposals(_domains_signature())
+
+
+def find_all_proposals() -> List[dict]:
+    """Trouve toutes les propositions dans le répertoire domains/"""
+    return list(_proposal_index()["proposals"])
+
+
+def find_proposal(proposal_id: str) -> Optional[dict]:
+    """Retrouve une proposition par son id (recherche dans l'index)"""
+    return _proposal_index()["by_id"].get(proposal_id)
+
+
+def _file_stats(paths) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """(mtime_ns, taille) de chaque fichier, None s'il n'existe pas"""
+    stats = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            stats.append(None)
+            continue
+        stats.append((st.st_mtime_ns, st.st_size))
+    return tuple(stats)
+
+
+def _votes_signature() -> Tuple[Optional[Tuple[int, int]], ...]:
+    """Signature des fichiers de votes (votes.json et journaux)"""
+    return _file_stats((VOTES_PATH, VOTES_PENDING_LOG_PATH, VOTES_LOG_PATH))
+
+
+def make_etag(*parts) -> str:
+    """ETag faible dérivé des signatures de fichiers (stable entre workers et redémarrages)"""
+    digest = hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Vrai si l'en-tête If-None-Match de la requête correspond à l'ETag (comparaison faible)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def not_modified(etag: str) -> Response:
+    """Réponse 304 sans corps"""
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def _proposal_detail_lookup(proposal_id: str) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Retrouve une proposition et calcule l'ETag de son détail.
+
+    L'ETag couvre les propositions, les votes et les fichiers de validation
+    et de simulation de la proposition.
+    """
+    signature = _domains_signature()
+    index = _cached_proposals(signature)
+    proposal = index["by_id"].get(proposal_id)
+    if proposal is None:
+        return None, None
+
+    proposal_dir = index["path_by_id"][proposal_id].parent
+    sidecar_stats = _file_stats((
+        proposal_dir / "validation.json",
+        proposal_dir / "simulation_quick.json",
+        proposal_dir / "simulation_deep.json"
+    ))
+    return proposal, make_etag(signature, _votes_signature(), sidecar_stats)
+
+
+async def load_proposal_files(proposal_id: str, domain: str) -> dict:
+    """Charge tous les fichiers d'une proposition (proposal, validation, simulation) en parallèle"""
+    indexed_file = _proposal_index()["path_by_id"].get(proposal_id)
+    if indexed_file is not None:
+        proposal_dir = indexed_file.parent
+    else:
+        proposal_dir = DOMAINS_PATH / domain / "proposals" / proposal_id
+
+    # Simulation : essayer quick puis deep
     simulation_file = proposal_dir / "simulation_quick.json"
     if not simulation_file.exists():
         simulation_file = proposal_dir / "simulation_deep.json"
 
-    if simulation_file.exists():
-        with open(simulation_file, 'r', encoding='utf-8') as f:
-            result["simulation"] = json.load(f)
+    proposal, validation, simulation = await asyncio.gather(
+        read_json_async(proposal_dir / "proposal.json"),
+        read_json_async(proposal_dir / "validation.json"),
+        read_json_async(simulation_file)
+    )
 
-    return result
+    return {
+        "proposal": proposal,
+        "validation": validation,
+        "simulation": simulation
+    }
 
 
 # Endpoints
@@ -225,69 +734,63 @@ def root():
 @app.get("/health")
 def health():
     """Endpoint de santé"""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "healthy", "timestamp": now_iso()}
 
 
-@app.get("/api/v1/proposals", response_model=List[ProposalSummary])
-def list_proposals(domain: Optional[str] = None, status: Optional[str] = None):
+@app.get(
+    "/api/v1/proposals",
+    response_class=FastJSONResponse,
+    responses={200: {"model": List[ProposalSummary]}}
+)
+def list_proposals(request: Request, domain: Optional[str] = None, status: Optional[str] = None):
     """
     Liste toutes les propositions
 
     Paramètres:
     - domain: Filtrer par domaine (transport, energie, etc.)
     - status: Filtrer par statut (generated, validated, etc.)
+
+    Répond 304 si l'en-tête If-None-Match correspond à l'ETag courant.
     """
-    proposals = find_all_proposals()
-    votes_data = load_votes()
+    signature = _domains_signature()
+    etag = make_etag(signature, _votes_signature())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    static_summaries = _cached_proposals(signature)["summaries"]
+    vote_sums = load_vote_sums()
 
     # Filtrer par domaine si spécifié
     if domain:
-        proposals = [p for p in proposals if p.get("domain") == domain]
+        static_summaries = [p for p in static_summaries if p["domain"] == domain]
 
     # Filtrer par statut si spécifié
     if status:
-        proposals = [p for p in proposals if p.get("status") == status]
+        static_summaries = [p for p in static_summaries if p["status"] == status]
 
-    # Construire les résumés avec les statistiques de vote
+    # Compléter les résumés statiques avec les statistiques de vote
     summaries = []
-    for proposal in proposals:
-        proposal_id = proposal.get("id")
-        voting_summary = calculate_voting_summary(proposal_id, votes_data)
-
-        # Extraire les informations de réduction CO2 et coût
-        co2_reduction = None
-        total_cost = None
-
-        if "content" in proposal:
-            content = proposal["content"]
-            if "impact" in content:
-                co2_reduction = content["impact"].get("co2_reduction_tonnes_10y")
-            if "budget" in content:
-                total_cost = content["budget"].get("total_chf")
-
-        summaries.append(ProposalSummary(
-            id=proposal.get("id", ""),
-            domain=proposal.get("domain", ""),
-            title=proposal.get("title", ""),
-            description=proposal.get("description", ""),
-            status=proposal.get("status", ""),
-            co2_reduction_tonnes_10y=co2_reduction,
-            total_cost_chf=total_cost,
-            generated_at=proposal.get("generated_at", ""),
-            avg_impact_score=voting_summary["avg_impact_score"] if voting_summary["total_votes"] > 0 else None,
-            avg_feasibility_score=voting_summary["avg_feasibility_score"] if voting_summary["total_votes"] > 0 else None,
-            avg_desirability_score=voting_summary["avg_desirability_score"] if voting_summary["total_votes"] > 0 else None,
-            total_votes=voting_summary["total_votes"]
-        ))
+    for static_summary in static_summaries:
+        voting_summary = summarize_vote_sums(vote_sums.get(static_summary["id"]))
+        has_votes = voting_summary["total_votes"] > 0
+
+        summaries.append({
+            **static_summary,
+            "avg_impact_score": voting_summary["avg_impact_score"] if has_votes else None,
+            "avg_feasibility_score": voting_summary["avg_feasibility_score"] if has_votes else None,
+            "avg_desirability_score": voting_summary["avg_desirability_score"] if has_votes else None,
+            "total_votes": voting_summary["total_votes"]
+        })
 
     # Trier par date de génération (plus récent en premier)
-    summaries.sort(key=lambda x: x.generated_at, reverse=True)
+    summaries.sort(key=lambda x: x["generated_at"], reverse=True)
 
-    return summaries
+    # Dicts renvoyés tels quels : ProposalSummary ne sert qu'à la documentation OpenAPI
+    return FastJSONResponse(summaries, headers={"ETag": etag})
 
 
 @app.get("/api/v1/proposals/{proposal_id}", response_model=ProposalDetail)
-def get_proposal(proposal_id: str):
+async def get_proposal(proposal_id: str, request: Request, response: Response):
     """
     Récupère les détails complets d'une proposition
 
@@ -296,22 +799,30 @@ def get_proposal(proposal_id: str):
     - Les résultats de validation
     - Les résultats de simulation
     - Le résumé des votes
+
+    Répond 304 si l'en-tête If-None-Match correspond à l'ETag courant.
     """
-    proposals = find_all_proposals()
-    proposal = next((p for p in proposals if p.get("id") == proposal_id), None)
+    proposal, etag = await asyncio.to_thread(_proposal_detail_lookup, proposal_id)
 
     if not proposal:
         raise HTTPException(status_code=404, detail=f"Proposition {proposal_id} non trouvée")
 
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    # Fichiers de la proposition et agrégats de votes lus en parallèle
     domain = proposal.get("domain")
-    files = load_proposal_files(proposal_id, domain)
+    files, vote_sums = await asyncio.gather(
+        load_proposal_files(proposal_id, domain),
+        asyncio.to_thread(load_vote_sums)
+    )
 
     if not files["proposal"]:
         raise HTTPException(status_code=404, detail=f"Fichier de proposition {proposal_id} non trouvé")
 
     # Calculer le résumé des votes
-    votes_data = load_votes()
-    voting_summary = calculate_voting_summary(proposal_id, votes_data)
+    voting_summary = summarize_vote_sums(vote_sums.get(proposal_id))
 
     return ProposalDetail(
         id=files["proposal"].get("id", ""),
@@ -338,15 +849,11 @@ def vote_on_proposal(proposal_id: str, vote: VoteRequest):
     - Désirabilité sociale
     """
     # Vérifier que la proposition existe
-    proposals = find_all_proposals()
-    proposal = next((p for p in proposals if p.get("id") == proposal_id), None)
+    proposal = find_proposal(proposal_id)
 
     if not proposal:
         raise HTTPException(status_code=404, detail=f"Proposition {proposal_id} non trouvée")
 
-    # Charger les votes existants
-    votes_data = load_votes()
-
     # Créer le nouveau vote
     vote_id = str(uuid4())
     new_vote = {
@@ -357,18 +864,21 @@ def vote_on_proposal(proposal_id: str, vote: VoteRequest):
         "desirability_score": vote.desirability_score,
         "comment": vote.comment,
         "citizen_id": vote.citizen_id or "anonymous",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": now_iso()
     }
 
-    # Ajouter le vote
-    votes_data["votes"].append(new_vote)
+    # Ajouter le vote au journal (sans réécrire votes.json)
+    append_vote(new_vote)
 
-    # Mettre à jour le résumé
-    summary = calculate_voting_summary(proposal_id, votes_data)
-    votes_data["summaries"][proposal_id] = summary
+    # Intégrer le journal dans votes.json quand il devient volumineux
+    try:
+        if VOTES_LOG_PATH.stat().st_size >= VOTES_LOG_COMPACT_BYTES:
+            compact_votes()
+    except OSError as e:
+        print(f"Erreur lors de la compaction des votes: {e}")
 
-    # Sauvegarder
-    save_votes(votes_data)
+    # Résumé à jour de la proposition
+    summary = summarize_vote_sums(load_vote_sums().get(proposal_id))
 
     return VoteResponse(
         vote_id=vote_id,
@@ -379,20 +889,25 @@ def vote_on_proposal(proposal_id: str, vote: VoteRequest):
 
 
 @app.get("/api/v1/proposals/{proposal_id}/votes", response_model=VotingSummary)
-def get_voting_summary(proposal_id: str):
+def get_voting_summary(proposal_id: str, request: Request, response: Response):
     """
     Récupère le résumé des votes pour une proposition
+
+    Répond 304 si l'en-tête If-None-Match correspond à l'ETag courant.
     """
     # Vérifier que la proposition existe
-    proposals = find_all_proposals()
-    proposal = next((p for p in proposals if p.get("id") == proposal_id), None)
+    proposal = find_proposal(proposal_id)
 
     if not proposal:
         raise HTTPException(status_code=404, detail=f"Proposition {proposal_id} non trouvée")
 
-    # Charger les votes et calculer le résumé
-    votes_data = load_votes()
-    summary = calculate_voting_summary(proposal_id, votes_data)
+    etag = make_etag(proposal_id, _votes_signature())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    # Charger les agrégats de votes et calculer le résumé
+    summary = summarize_vote_sums(load_vote_sums().get(proposal_id))
 
     return VotingSummary(
         proposal_id=proposal_id,
@@ -415,4 +930,15 @@ def list_domains():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+
+    # Boucle uvloop, parseur httptools et plusieurs workers : les votes sont
+    # ajoutés sous verrou partagé (votes.lock), la compaction sous verrou
+    # exclusif et elle reste idempotente si elle est interrompue
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8002,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    )
@@ -6,18 +6,132 @@ l'exécution des plans complexes.
 """
 
 import asyncio
+import hashlib
 import json
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple, Union, AsyncIterator
 from datetime import datetime
-import aiohttp
-from pydantic import BaseModel, Field
+from time import monotonic, time_ns
+from graphlib import CycleError, TopologicalSorter
+import httpx
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
 import structlog
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter
+)
+
+try:
+    import orjson
+except ImportError:  # Repli sur le module json standard
+    orjson = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # pragma: no cover - cache sémantique désactivé
+    SentenceTransformer = None
 
 logger = structlog.get_logger()
 
+# Client HTTP/2 vers les workers vLLM: les requêtes simultanées sont
+# multiplexées sur une connexion persistante par endpoint
+HTTP_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+HTTP_LIMITS = httpx.Limits(
+    max_connections=256,
+    max_keepalive_connections=64,
+    keepalive_expiry=75
+)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# Cache exact des réponses pour les appels déterministes (planification)
+EXACT_CACHE_SIZE = 10_000
+EXACT_CACHE_MAX_TEMPERATURE = 0.2
+
+
+# Disjoncteur par endpoint: ouvert après N échecs consécutifs
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN_SECONDS = 30.0
+
+# Plafond de génération des réponses JSON (plan, vérifications)
+JSON_MAX_TOKENS = 800
+
+# Requêtes simultanées par endpoint lors des appels groupés
+BATCH_MAX_CONCURRENCY = 16
+
+
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """Sérialise en JSON (orjson si disponible), UTF-8 non échappé"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
+
+
+def _loads(data: Union[str, bytes]) -> Any:
+    """Parse du JSON (orjson si disponible)"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+# Formatage "nom:\nvaleur" d'un input d'étape
+_format_input = "{0}:\n{1}".format
+
+
+def format_ns(timestamp_ns: int) -> str:
+    """Formate un horodatage time_ns() en ISO 8601 local"""
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(
+        microsecond=nanoseconds // 1000
+    ).isoformat()
+
+
+def _extract_json(text: str) -> Any:
+    """
+    Parse l'objet JSON d'une réponse LLM
+
+    Ignore la prose ou les balises ```json autour de l'objet externe.
+    """
+    start = text.find("{")
+    end = text.rfind("}")
+    if start < 0 or end < start:
+        return _loads(text)
+    return _loads(text[start:end + 1])
+
+
+def exact_cache_key(
+    model: str,
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+    system_prompt: Optional[str] = None
+) -> str:
+    """Clé SHA-256 d'un appel LLM"""
+    key = {
+        "model": model,
+        "system": system_prompt,
+        "prompt": prompt,
+        "temp": temperature,
+        "max": max_tokens
+    }
+    if orjson is not None:
+        raw = orjson.dumps(key, option=orjson.OPT_SORT_KEYS)
+    else:
+        raw = json.dumps(key, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def create_session() -> httpx.AsyncClient:
+    """Crée un client HTTP partageable entre services"""
+    return httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
 
 class TaskStep(BaseModel):
     """Une étape dans le plan d'exécution"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     step: int
     llm: str
     action: str
@@ -28,6 +142,8 @@ class TaskStep(BaseModel):
 
 class ExecutionPlan(BaseModel):
     """Plan d'exécution généré par l'orchestrateur"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     task_id: str
     domain: str
     plan: List[TaskStep]
@@ -36,8 +152,22 @@ class ExecutionPlan(BaseModel):
     priority: str = "normal"
 
 
+def _plan_response_schema() -> Dict[str, Any]:
+    """Schéma JSON attendu du LLM de planification (sans task_id/domain)"""
+    schema = ExecutionPlan.model_json_schema()
+    for field in ("task_id", "domain"):
+        schema["properties"].pop(field)
+        schema["required"].remove(field)
+    return schema
+
+
+PLAN_RESPONSE_SCHEMA = _plan_response_schema()
+
+
 class LLMEndpoint(BaseModel):
     """Configuration d'un endpoint LLM"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     name: str
     url: str
     model: str
@@ -45,14 +175,181 @@ class LLMEndpoint(BaseModel):
     cost_per_1k_tokens: float = 0.0  # Coût fictif pour priorisation
 
 
+class SemanticCache:
+    """
+    Cache de réponses LLM indexé par similarité d'embedding du prompt
+
+    Les embeddings sont normalisés: le produit scalaire est la similarité
+    cosinus. Un index par endpoint, éviction LRU au-delà de max_entries.
+    """
+    
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        threshold: float = 0.92,
+        max_entries: int = 2048
+    ):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0}
+        self._model = None
+        self._entries: Dict[str, "OrderedDict[str, Tuple[np.ndarray, str]]"] = {}
+        self._matrices: Dict[str, Tuple[List[str], np.ndarray]] = {}
+    
+    @property
+    def enabled(self) -> bool:
+        return SentenceTransformer is not None
+    
+    def embed(self, prompt: str) -> np.ndarray:
+        """Calcule l'embedding normalisé d'un prompt (modèle chargé à la demande)"""
+        if self._model is None:
+            self._model = SentenceTransformer(self.model_name)
+        return self._model.encode(
+            prompt, normalize_embeddings=True
+        ).astype(np.float32)
+    
+    def lookup(self, endpoint: str, vector: np.ndarray) -> Optional[str]:
+        """Renvoie la réponse la plus proche si elle dépasse le seuil"""
+        entries = self._entries.get(endpoint)
+        if not entries:
+            self.stats["misses"] += 1
+            return None
+        
+        keys, matrix = self._matrix(endpoint)
+        similarities = matrix @ vector
+        best = int(np.argmax(similarities))
+        
+        if similarities[best] < self.threshold:
+            self.stats["misses"] += 1
+            return None
+        
+        key = keys[best]
+        entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entries[key][1]
+    
+    def store(self, endpoint: str, prompt: str, vector: np.ndarray, response: str):
+        """Ajoute une réponse à l'index de l'endpoint"""
+        entries = self._entries.setdefault(endpoint, OrderedDict())
+        entries[prompt] = (vector, response)
+        entries.move_to_end(prompt)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        self._matrices.pop(endpoint, None)
+    
+    def _matrix(self, endpoint: str) -> Tuple[List[str], np.ndarray]:
+        """Empile les embeddings de l'endpoint (reconstruit après ajout)"""
+        cached = self._matrices.get(endpoint)
+        if cached is None:
+            entries = self._entries[endpoint]
+            cached = (
+                list(entries),
+                np.stack([vector for vector, _ in entries.values()])
+            )
+            self._matrices[endpoint] = cached
+        return cached
+
+
+class LLMServerError(RuntimeError):
+    """Réponse 5xx d'un endpoint LLM (réessayable)"""
+
+
+class CircuitOpenError(RuntimeError):
+    """Endpoint LLM court-circuité par son disjoncteur"""
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur d'un endpoint LLM
+
+    closed: appels autorisés. open: appels refusés jusqu'à la fin du
+    délai de refroidissement. half_open: un seul appel d'essai, qui
+    referme ou rouvre le disjoncteur.
+    """
+    
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN_SECONDS
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.fail_count = 0
+        self.next_try_ts = 0.0
+    
+    @property
+    def is_open(self) -> bool:
+        """Vrai tant que les appels doivent partir directement au fallback"""
+        if self.state == "open":
+            return monotonic() < self.next_try_ts
+        return self.state == "half_open"
+    
+    def allow(self) -> bool:
+        """Autorise un appel (et passe en half_open après refroidissement)"""
+        if self.state == "closed":
+            return True
+        if self.state == "open" and monotonic() >= self.next_try_ts:
+            self.state = "half_open"
+            return True
+        return False
+    
+    def record_success(self):
+        self.state = "closed"
+        self.fail_count = 0
+    
+    def record_failure(self):
+        self.fail_count += 1
+        if self.state == "half_open" or self.fail_count >= self.failure_threshold:
+            self.state = "open"
+            self.next_try_ts = monotonic() + self.cooldown
+
+
+class ExternalInputs(dict):
+    """Libellés des inputs externes (contexte, données), formatés une fois"""
+    
+    def __missing__(self, name: str) -> str:
+        value = self[name] = f"[External data: {name}]"
+        return value
+
+
 class Orchestrator:
     """
     Orchestrateur central qui coordonne les LLM workers
     """
     
-    def __init__(self, config_path: str = "config/llm_endpoints.json"):
+    # Gabarit des prompts d'étape, analysé une seule fois
+    _STEP_TEMPLATE = """ACTION: {action}
+
+INPUTS:
+{inputs}
+
+INSTRUCTIONS:
+Exécute l'action demandée en utilisant les inputs fournis.
+Produis un résultat de haute qualité qui sera utilisé pour les étapes suivantes.
+
+OUTPUT ATTENDU: {expected}
+""".format_map
+    
+    def __init__(
+        self,
+        config_path: str = "config/llm_endpoints.json",
+        session: Optional[httpx.AsyncClient] = None
+    ):
         self.endpoints = self._load_endpoints(config_path)
-        self.session: Optional[aiohttp.ClientSession] = None
+        # Le répertoire des LLM est figé après chargement: le préfixe de
+        # planification est construit une fois, identique octet pour octet
+        self._planning_system = self._build_planning_system_prompt()
+        # Une session injectée reste la propriété de l'appelant
+        self.session: Optional[httpx.AsyncClient] = session
+        self._owns_session = session is None
+        self.semantic_cache = SemanticCache()
+        self._exact_cache: "OrderedDict[str, str]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+        self._batch_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._external_inputs = ExternalInputs()
+        self._breakers: Dict[str, CircuitBreaker] = {}
         self.logger = logger.bind(service="orchestrator")
     
     def _load_endpoints(self, config_path: str) -> Dict[str, LLMEndpoint]:
@@ -86,19 +383,22 @@ class Orchestrator:
         }
         
         return {
-            name: LLMEndpoint(**config)
+            name: LLMEndpoint.model_validate(config)
             for name, config in default_config.items()
         }
     
     async def initialize(self):
         """Initialise les connexions"""
-        self.session = aiohttp.ClientSession()
+        if self.session is None:
+            self.session = create_session()
+            self._owns_session = True
         self.logger.info("orchestrator_initialized", endpoints=list(self.endpoints.keys()))
     
     async def shutdown(self):
         """Ferme les connexions"""
-        if self.session:
-            await self.session.close()
+        if self.session and self._owns_session:
+            await self.session.aclose()
+        self.session = None
     
     async def create_execution_plan(
         self,
@@ -122,17 +422,20 @@ class Orchestrator:
             endpoint="orchestrator",
             prompt=planning_prompt,
             temperature=0.2,
-            max_tokens=2000
+            max_tokens=JSON_MAX_TOKENS,
+            system_prompt=self._planning_system,
+            response_format={"type": "json_object"},
+            guided_json=PLAN_RESPONSE_SCHEMA
         )
         
         # Parse la réponse JSON
         try:
-            plan_data = json.loads(response)
-            plan = ExecutionPlan(
-                task_id=f"{domain}_{datetime.now().isoformat()}",
-                domain=domain,
-                **plan_data
-            )
+            plan_data = _extract_json(response)
+            plan = ExecutionPlan.model_validate({
+                **plan_data,
+                "task_id": f"{domain}_{time_ns()}",
+                "domain": domain
+            })
             
             self.logger.info(
                 "execution_plan_created",
@@ -146,26 +449,15 @@ class Orchestrator:
             # Fallback à un plan simple
             return self._create_fallback_plan(task_type, domain)
     
-    def _build_planning_prompt(
-        self,
-        task_type: str,
-        domain: str,
-        context: Dict[str, Any]
-    ) -> str:
-        """Construit le prompt de planification"""
+    def _build_planning_system_prompt(self) -> str:
+        """Partie invariante du prompt de planification (préfixe cacheable)"""
         
         available_llms = "\n".join([
             f"- {name}: {ep.specialization}" 
             for name, ep in self.endpoints.items()
         ])
         
-        return f"""Tu es l'orchestrateur du Climate AI Collective. Ta mission est de créer un plan d'exécution optimal pour la tâche suivante.
-
-TÂCHE: {task_type}
-DOMAINE: {domain}
-
-CONTEXTE:
-{json.dumps(context, indent=2, ensure_ascii=False)}
+        return f"""Tu es l'orchestrateur du Climate AI Collective. Ta mission est de créer un plan d'exécution optimal pour la tâche fournie par l'utilisateur.
 
 LLM DISPONIBLES:
 {available_llms}
@@ -195,12 +487,27 @@ Réponds UNIQUEMENT avec un objet JSON valide selon ce format:
 }}
 
 NE RÉPONDS QU'AVEC LE JSON, RIEN D'AUTRE.
+"""
+    
+    def _build_planning_prompt(
+        self,
+        task_type: str,
+        domain: str,
+        context: Dict[str, Any]
+    ) -> str:
+        """Construit la partie variable du prompt de planification"""
+        
+        return f"""TÂCHE: {task_type}
+DOMAINE: {domain}
+
+CONTEXTE:
+{_dumps(context, indent=True)}
 """
     
     def _create_fallback_plan(self, task_type: str, domain: str) -> ExecutionPlan:
         """Crée un plan de secours simple"""
         return ExecutionPlan(
-            task_id=f"{domain}_fallback_{datetime.now().isoformat()}",
+            task_id=f"{domain}_fallback_{time_ns()}",
             domain=domain,
             plan=[
                 TaskStep(
@@ -214,73 +521,111 @@ NE RÉPONDS QU'AVEC LE JSON, RIEN D'AUTRE.
             estimated_duration_minutes=10
         )
     
+    def _plan_layers(self, plan: ExecutionPlan) -> List[List[TaskStep]]:
+        """
+        Découpe le plan en couches d'étapes indépendantes
+
+        Une étape dépend des étapes dont elle consomme la sortie
+        (``step_N`` ou ``expected_output``), sauf celles déclarées dans
+        ``parallel_with``. En cas de cycle, on revient à l'ordre séquentiel.
+        """
+        by_number = {step.step: step for step in plan.plan}
+        if len(by_number) != len(plan.plan):
+            return [[step] for step in plan.plan]
+
+        producers: Dict[str, int] = {}
+        for step in plan.plan:
+            producers.setdefault(f"step_{step.step}", step.step)
+            producers.setdefault(step.expected_output, step.step)
+
+        sorter = TopologicalSorter()
+        for step in plan.plan:
+            parallel = set(step.parallel_with or ())
+            dependencies = {
+                producers[name]
+                for name in step.inputs
+                if name in producers
+            }
+            dependencies.discard(step.step)
+            dependencies -= parallel
+            dependencies = {
+                dep for dep in dependencies
+                if step.step not in (by_number[dep].parallel_with or ())
+            }
+            sorter.add(step.step, *dependencies)
+
+        try:
+            sorter.prepare()
+        except CycleError as e:
+            self.logger.warning("plan_cycle_detected", task_id=plan.task_id, cycle=e.args[1])
+            return [[step] for step in plan.plan]
+
+        layers = []
+        while sorter.is_active():
+            ready = sorted(sorter.get_ready())
+            layers.append([by_number[number] for number in ready])
+            sorter.done(*ready)
+
+        return layers
+
     async def execute_plan(self, plan: ExecutionPlan) -> Dict[str, Any]:
         """
         Exécute un plan d'exécution
+
+        Les étapes d'une même couche sont lancées ensemble, regroupées
+        par endpoint cible.
         """
         self.logger.info("executing_plan", task_id=plan.task_id)
         
         results = {}
+        # Sorties déjà produites, par "step_N" et par expected_output
+        output_index: Dict[str, str] = {}
         
-        for step in plan.plan:
-            self.logger.info(
-                "executing_step",
-                task_id=plan.task_id,
-                step=step.step,
-                llm=step.llm
-            )
-            
-            # Récupère les inputs depuis les résultats précédents
-            inputs = self._gather_inputs(step.inputs, results)
-            
-            # Construit le prompt pour cette étape
-            prompt = self._build_step_prompt(step, inputs)
-            
-            # Appelle le LLM approprié
-            try:
-                response = await self.call_llm(
-                    endpoint=step.llm,
-                    prompt=prompt,
-                    temperature=0.7 if "generate" in step.action else 0.2,
-                    max_tokens=4000
-                )
-                
-                results[f"step_{step.step}"] = {
-                    "llm": step.llm,
-                    "action": step.action,
-                    "output": response,
-                    "timestamp": datetime.now().isoformat()
-                }
-                
-            except Exception as e:
-                self.logger.error(
-                    "step_execution_failed",
+        for layer in self._plan_layers(plan):
+            prompts = {}
+            for step in layer:
+                self.logger.info(
+                    "executing_step",
+                    task_id=plan.task_id,
                     step=step.step,
-                    error=str(e)
+                    llm=step.llm
                 )
-                
-                # Tente le fallback si disponible
-                if step.llm in plan.fallback:
-                    fallback_llm = plan.fallback[step.llm]
-                    self.logger.info("attempting_fallback", fallback=fallback_llm)
-                    
-                    response = await self.call_llm(
-                        endpoint=fallback_llm,
-                        prompt=prompt,
-                        temperature=0.7,
-                        max_tokens=4000
+                # Récupère les inputs depuis les résultats précédents
+                inputs = self._gather_inputs(step.inputs, output_index)
+                # Construit le prompt pour cette étape
+                prompts[step.step] = self._build_step_prompt(step, inputs)
+            
+            responses = await self._dispatch_layer(layer, prompts)
+            
+            outcomes = await asyncio.gather(
+                *[
+                    self._complete_step(
+                        plan, step, prompts[step.step], responses[step.step]
                     )
-                    
-                    results[f"step_{step.step}"] = {
-                        "llm": fallback_llm,
-                        "action": step.action,
-                        "output": response,
-                        "timestamp": datetime.now().isoformat(),
-                        "fallback": True
-                    }
+                    for step in layer
+                ],
+                return_exceptions=True
+            )
+            
+            for outcome in outcomes:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+                step_key, step_result = outcome
+                if step_result is not None:
+                    results[step_key] = step_result
+            
+            for step in layer:
+                step_result = results.get(f"step_{step.step}")
+                if step_result is not None:
+                    output_index[f"step_{step.step}"] = step_result["output"]
+                    output_index[step.expected_output] = step_result["output"]
         
         self.logger.info("plan_execution_complete", task_id=plan.task_id)
         
+        # Horodatages relevés en ns pendant l'exécution, formatés une fois
+        for step_result in results.values():
+            step_result["timestamp"] = format_ns(step_result["timestamp"])
+        
         return {
             "task_id": plan.task_id,
             "domain": plan.domain,
@@ -288,90 +633,416 @@ NE RÉPONDS QU'AVEC LE JSON, RIEN D'AUTRE.
             "completed_at": datetime.now().isoformat()
         }
     
-    def _gather_inputs(
+    async def _dispatch_layer(
         self,
-        input_names: List[str],
-        previous_results: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Récupère les inputs depuis les résultats précédents"""
-        inputs = {}
+        layer: List[TaskStep],
+        prompts: Dict[int, str]
+    ) -> Dict[int, Union[str, BaseException]]:
+        """Envoie les étapes d'une couche, un lot par (endpoint, température)"""
+        responses: Dict[int, Union[str, BaseException]] = {}
+        groups: Dict[Tuple[str, float], List[TaskStep]] = {}
+        for step in layer:
+            # Disjoncteur ouvert: l'étape part directement au fallback
+            if self._breaker(step.llm).is_open:
+                responses[step.step] = CircuitOpenError(
+                    f"Circuit open for endpoint: {step.llm}"
+                )
+                continue
+            temperature = 0.7 if "generate" in step.action else 0.2
+            groups.setdefault((step.llm, temperature), []).append(step)
         
-        for name in input_names:
-            if name in previous_results:
-                inputs[name] = previous_results[name].get("output", "")
-            else:
-                # Input externe (contexte, données)
-                inputs[name] = f"[External data: {name}]"
+        batches = await asyncio.gather(*[
+            self.call_llms_batch(
+                endpoint=llm,
+                prompts=[prompts[step.step] for step in steps],
+                temperature=temperature,
+                max_tokens=4000
+            )
+            for (llm, temperature), steps in groups.items()
+        ])
         
-        return inputs
+        for steps, batch in zip(groups.values(), batches):
+            for step, response in zip(steps, batch):
+                responses[step.step] = response
+        return responses
     
-    def _build_step_prompt(self, step: TaskStep, inputs: Dict[str, Any]) -> str:
-        """Construit le prompt pour une étape"""
+    async def _complete_step(
+        self,
+        plan: ExecutionPlan,
+        step: TaskStep,
+        prompt: str,
+        response: Union[str, BaseException]
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Construit le résultat d'une étape, en passant au fallback si besoin"""
+        step_key = f"step_{step.step}"
         
-        inputs_text = "\n".join([
-            f"{name}:\n{value}"
-            for name, value in inputs.items()
-        ])
+        if not isinstance(response, BaseException):
+            return step_key, {
+                "llm": step.llm,
+                "action": step.action,
+                "output": response,
+                "timestamp": time_ns()
+            }
         
-        return f"""ACTION: {step.action}
-
-INPUTS:
-{inputs_text}
-
-INSTRUCTIONS:
-Exécute l'action demandée en utilisant les inputs fournis.
-Produis un résultat de haute qualité qui sera utilisé pour les étapes suivantes.
-
-OUTPUT ATTENDU: {step.expected_output}
-"""
+        self.logger.error(
+            "step_execution_failed",
+            step=step.step,
+            error=str(response)
+        )
+        
+        # Tente le fallback si disponible
+        if step.llm not in plan.fallback:
+            return step_key, None
+        
+        fallback_llm = plan.fallback[step.llm]
+        self.logger.info("attempting_fallback", fallback=fallback_llm)
+        
+        response = await self.call_llm(
+            endpoint=fallback_llm,
+            prompt=prompt,
+            temperature=0.7,
+            max_tokens=4000
+        )
+        
+        return step_key, {
+            "llm": fallback_llm,
+            "action": step.action,
+            "output": response,
+            "timestamp": time_ns(),
+            "fallback": True
+        }
+    
+    def _gather_inputs(
+        self,
+        input_names: List[str],
+        output_index: Dict[str, str]
+    ) -> Dict[str, str]:
+        """Récupère les inputs depuis l'index des sorties précédentes"""
+        external = self._external_inputs
+        return {
+            name: output_index[name] if name in output_index else external[name]
+            for name in input_names
+        }
+    
+    def _build_step_prompt(self, step: TaskStep, inputs: Dict[str, Any]) -> str:
+        """Construit le prompt pour une étape"""
+        return self._STEP_TEMPLATE({
+            "action": step.action,
+            "inputs": "\n".join(map(_format_input, inputs.keys(), inputs.values())),
+            "expected": step.expected_output
+        })
     
     async def call_llm(
         self,
         endpoint: str,
         prompt: str,
         temperature: float = 0.7,
-        max_tokens: int = 2000
-    ) -> str:
+        max_tokens: int = JSON_MAX_TOKENS,
+        system_prompt: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        guided_json: Optional[Dict[str, Any]] = None,
+        stream: bool = False
+    ) -> Union[str, AsyncIterator[str]]:
         """
         Appelle un LLM via son endpoint vLLM
+
+        Le system_prompt, invariant d'un appel à l'autre, est envoyé en
+        message séparé marqué cache_control pour réutiliser le préfixe.
+        response_format / guided_json activent le décodage contraint de
+        vLLM, qui s'arrête dès que le JSON attendu est complet.
+        Avec stream=True, renvoie un itérateur asynchrone des fragments
+        de texte au fil de la génération (SSE).
         """
         if endpoint not in self.endpoints:
             raise ValueError(f"Unknown endpoint: {endpoint}")
         
         ep = self.endpoints[endpoint]
         
-        if not self.session:
-            await self.initialize()
+        if self.session is None:
+            raise RuntimeError("Orchestrator not initialized")
+        
+        if stream:
+            return self._stream_llm(
+                endpoint, prompt, temperature, max_tokens, system_prompt,
+                response_format=response_format, guided_json=guided_json
+            )
+        
+        # Cache exact, consulté avant le calcul d'embedding
+        cache_key = None
+        if temperature <= EXACT_CACHE_MAX_TEMPERATURE:
+            cache_key = exact_cache_key(
+                ep.model, prompt, temperature, max_tokens, system_prompt
+            )
+            cached = self._exact_cache.get(cache_key)
+            if cached is not None:
+                self._exact_cache.move_to_end(cache_key)
+                self.stats["hits"] += 1
+                return cached
+            self.stats["misses"] += 1
+        
+        # Cache sémantique: lecture seulement pour les appels déterministes,
+        # écriture tant que la température reste modérée
+        cache = self.semantic_cache
+        cache_scope = endpoint
+        if system_prompt is not None:
+            digest = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+            cache_scope = f"{endpoint}:{digest[:16]}"
+        vector = None
+        if cache.enabled and temperature <= 0.5:
+            vector = await asyncio.to_thread(cache.embed, prompt)
+            if temperature <= 0.2:
+                cached = cache.lookup(cache_scope, vector)
+                if cached is not None:
+                    self.logger.debug("semantic_cache_hit", endpoint=endpoint)
+                    return cached
         
         url = f"{ep.url}/chat/completions"
+        payload = self._build_payload(
+            ep, prompt, temperature, max_tokens, system_prompt,
+            response_format=response_format, guided_json=guided_json
+        )
+        
+        breaker = self._breaker(endpoint)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for endpoint: {endpoint}")
+        probe = breaker.state == "half_open"
+        
+        try:
+            response = await self._post(url, _dumps(payload))
+        except (httpx.HTTPError, LLMServerError) as e:
+            breaker.record_failure()
+            self.logger.error(
+                "llm_call_failed",
+                endpoint=endpoint,
+                error=str(e),
+                breaker=breaker.state
+            )
+            raise
+        except BaseException:
+            # Appel d'essai interrompu (annulation, erreur inattendue) : sans
+            # cela le disjoncteur resterait half_open et refuserait tout appel
+            if probe and breaker.state == "half_open":
+                breaker.record_failure()
+            raise
+        
+        breaker.record_success()
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"LLM call failed: {response.status_code} - {response.text}"
+            )
+        
+        data = _loads(response.content)
+        content = data["choices"][0]["message"]["content"]
+        self._log_usage(endpoint, data.get("usage"))
+        if cache_key is not None:
+            self._exact_cache[cache_key] = content
+            if len(self._exact_cache) > EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+        if vector is not None:
+            cache.store(cache_scope, prompt, vector, content)
+        return content
+    
+    @retry(
+        stop=stop_after_attempt(2),
+        wait=wait_exponential_jitter(initial=0.2, max=2),
+        retry=retry_if_exception_type((httpx.TransportError, LLMServerError)),
+        reraise=True
+    )
+    async def _post(self, url: str, body: str) -> httpx.Response:
+        """POST JSON, réessayé une fois (avec jitter) sur erreur réseau ou 5xx"""
+        response = await self.session.post(url, content=body, headers=JSON_HEADERS)
+        if response.status_code >= 500:
+            raise LLMServerError(
+                f"LLM call failed: {response.status_code} - {response.text}"
+            )
+        return response
+    
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        """Disjoncteur associé à un endpoint"""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker()
+        return breaker
+    
+    def _build_payload(
+        self,
+        ep: LLMEndpoint,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system_prompt: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        guided_json: Optional[Dict[str, Any]] = None,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """Construit le corps d'une requête /chat/completions"""
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt is not None:
+            messages.insert(0, {
+                "role": "system",
+                "content": system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            })
         
         payload = {
             "model": ep.model,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
+            "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens
         }
+        if response_format is not None:
+            payload["response_format"] = response_format
+        if guided_json is not None:
+            payload["guided_json"] = guided_json
+        if stream:
+            payload["stream"] = True
+        return payload
+    
+    async def _stream_llm(
+        self,
+        endpoint: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system_prompt: Optional[str],
+        response_format: Optional[Dict[str, Any]] = None,
+        guided_json: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Génère les fragments d'une réponse en streaming SSE"""
+        ep = self.endpoints[endpoint]
+        
+        # Une réponse déjà en cache exact est renvoyée d'un bloc
+        cache_key = None
+        if temperature <= EXACT_CACHE_MAX_TEMPERATURE:
+            cache_key = exact_cache_key(
+                ep.model, prompt, temperature, max_tokens, system_prompt
+            )
+            cached = self._exact_cache.get(cache_key)
+            if cached is not None:
+                self._exact_cache.move_to_end(cache_key)
+                self.stats["hits"] += 1
+                yield cached
+                return
+            self.stats["misses"] += 1
+        
+        url = f"{ep.url}/chat/completions"
+        payload = self._build_payload(
+            ep, prompt, temperature, max_tokens, system_prompt,
+            response_format=response_format, guided_json=guided_json,
+            stream=True
+        )
+        parts = []
+        
+        breaker = self._breaker(endpoint)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for endpoint: {endpoint}")
+        probe = breaker.state == "half_open"
         
         try:
-            async with self.session.post(url, json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data["choices"][0]["message"]["content"]
-                else:
-                    error_text = await response.text()
+            async with self.session.stream(
+                "POST", url, content=_dumps(payload), headers=JSON_HEADERS
+            ) as response:
+                if response.status_code >= 500:
+                    error_text = (await response.aread()).decode("utf-8", "replace")
+                    raise LLMServerError(
+                        f"LLM call failed: {response.status_code} - {error_text}"
+                    )
+                breaker.record_success()
+                if response.status_code != 200:
+                    error_text = (await response.aread()).decode("utf-8", "replace")
                     raise RuntimeError(
-                        f"LLM call failed: {response.status} - {error_text}"
+                        f"LLM call failed: {response.status_code} - {error_text}"
                     )
+                
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    
+                    chunk = _loads(data)
+                    if chunk.get("usage"):
+                        self._log_usage(endpoint, chunk["usage"])
+                    if not chunk.get("choices"):
+                        continue
+                    delta = chunk["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        parts.append(delta)
+                        yield delta
         
-        except aiohttp.ClientError as e:
+        except (httpx.HTTPError, LLMServerError) as e:
+            breaker.record_failure()
             self.logger.error(
                 "llm_call_failed",
                 endpoint=endpoint,
-                error=str(e)
+                error=str(e),
+                breaker=breaker.state
             )
             raise
+        except BaseException:
+            # Appel d'essai interrompu (annulation, erreur inattendue) : sans
+            # cela le disjoncteur resterait half_open et refuserait tout appel
+            if probe and breaker.state == "half_open":
+                breaker.record_failure()
+            raise
+        
+        if cache_key is not None:
+            self._exact_cache[cache_key] = "".join(parts)
+            if len(self._exact_cache) > EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+    
+    def _log_usage(self, endpoint: str, usage: Optional[Dict[str, Any]]):
+        """Trace l'usage des tokens, dont la part servie par le cache de préfixe"""
+        if not usage:
+            return
+        details = usage.get("prompt_tokens_details") or {}
+        self.logger.debug(
+            "llm_usage",
+            endpoint=endpoint,
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+            cache_read_input_tokens=usage.get(
+                "cache_read_input_tokens", details.get("cached_tokens")
+            )
+        )
+
+    
+    async def call_llms_batch(
+        self,
+        endpoint: str,
+        prompts: List[str],
+        temperature: float = 0.7,
+        max_tokens: int = JSON_MAX_TOKENS,
+        system_prompt: Optional[str] = None
+    ) -> List[Union[str, BaseException]]:
+        """
+        Appelle un LLM sur plusieurs prompts
+
+        Les requêtes partent ensemble sur le pool de connexions, dans la
+        limite de BATCH_MAX_CONCURRENCY par endpoint; vLLM les regroupe
+        côté serveur (continuous batching). Les erreurs sont renvoyées
+        à la place de la réponse correspondante.
+        """
+        semaphore = self._batch_semaphores.get(endpoint)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+            self._batch_semaphores[endpoint] = semaphore
+        
+        async def call(prompt: str) -> str:
+            async with semaphore:
+                return await self.call_llm(
+                    endpoint=endpoint,
+                    prompt=prompt,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    system_prompt=system_prompt
+                )
+        
+        return await asyncio.gather(
+            *[call(prompt) for prompt in prompts],
+            return_exceptions=True
+        )
 
 
 async def main():
@@ -392,7 +1063,7 @@ async def main():
         
         results = await orchestrator.execute_plan(plan)
         
-        print(json.dumps(results, indent=2, ensure_ascii=False))
+        print(_dumps(results, indent=True))
     
     finally:
         await orchestrator.shutdown()
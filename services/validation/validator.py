@@ -7,19 +7,211 @@ Service de validation en trois couches:
 3. Simulation approfondie (modèles scientifiques)
 """
 
+import asyncio
+import hashlib
 import json
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 import numpy as np
 import structlog
-import aiohttp
+import httpx
+
+try:
+    import orjson
+except ImportError:  # Repli sur le module json standard
+    orjson = None
 
 logger = structlog.get_logger()
 
+# Client HTTP/2 vers le worker vLLM: les requêtes simultanées sont
+# multiplexées sur une connexion persistante
+HTTP_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+HTTP_LIMITS = httpx.Limits(
+    max_connections=256,
+    max_keepalive_connections=64,
+    keepalive_expiry=75
+)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# Cache exact des vérifications LLM (re-validation d'une même proposition)
+EXACT_CACHE_SIZE = 10_000
+
+
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """Sérialise en JSON (orjson si disponible), UTF-8 non échappé"""
+    if orjson is not None:
+        option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_SERIALIZE_NUMPY
+            | (orjson.OPT_INDENT_2 if indent else 0)
+        )
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
+
+
+def _loads(data: Union[str, bytes]) -> Any:
+    """Parse du JSON (orjson si disponible)"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _extract_json(text: str) -> Any:
+    """
+    Parse l'objet JSON d'une réponse LLM
+
+    Ignore la prose ou les balises ```json autour de l'objet externe.
+    """
+    start = text.find("{")
+    end = text.rfind("}")
+    if start < 0 or end < start:
+        return _loads(text)
+    return _loads(text[start:end + 1])
+
+
+def exact_cache_key(
+    model: str,
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+    system_prompt: Optional[str] = None
+) -> str:
+    """Clé SHA-256 d'un appel LLM"""
+    key = {
+        "model": model,
+        "system": system_prompt,
+        "prompt": prompt,
+        "temp": temperature,
+        "max": max_tokens
+    }
+    if orjson is not None:
+        raw = orjson.dumps(key, option=orjson.OPT_SORT_KEYS)
+    else:
+        raw = json.dumps(key, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+# Grille d'évaluation invariante, envoyée en message system pour que le
+# backend réutilise le préfixe d'un appel à l'autre
+COHERENCE_SYSTEM_PROMPT = """Tu es un expert scientifique chargé de valider des propositions climatiques.
+
+Analyse la proposition fournie selon ces critères:
+
+1. COHÉRENCE PHYSIQUE:
+   - Les chiffres de réduction CO2 sont-ils réalistes?
+   - Les ordres de grandeur sont-ils corrects?
+   - Y a-t-il des violations de lois physiques?
+
+2. COHÉRENCE ÉCONOMIQUE:
+   - Le ratio coût/impact est-il dans des standards acceptables (<500 CHF/tonne CO2)?
+   - Les coûts sont-ils estimés de façon crédible?
+
+3. COHÉRENCE TEMPORELLE:
+   - Le timeline est-il réaliste?
+   - Les étapes sont-elles logiquement ordonnées?
+
+4. QUALITÉ DES RÉFÉRENCES:
+   - Les sources citées sont-elles pertinentes?
+   - Manque-t-il des références essentielles?
+
+Réponds UNIQUEMENT avec un objet JSON valide:
+{
+    "physical_coherence": {"valid": true/false, "issues": ["issue1"]},
+    "economic_coherence": {"valid": true/false, "issues": []},
+    "temporal_coherence": {"valid": true/false, "issues": []},
+    "references_quality": {"score": 0-10, "issues": []},
+    "overall_score": 0-10,
+    "blocking_issues": [],
+    "recommendations": ["rec1", "rec2"]
+}
+
+NE RÉPONDS QU'AVEC LE JSON.
+"""
+
+
+# Plafond de génération et schéma imposé à la réponse de cohérence
+COHERENCE_MAX_TOKENS = 800
+_COHERENCE_CHECK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "valid": {"type": "boolean"},
+        "issues": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["valid", "issues"]
+}
+COHERENCE_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "physical_coherence": _COHERENCE_CHECK_SCHEMA,
+        "economic_coherence": _COHERENCE_CHECK_SCHEMA,
+        "temporal_coherence": _COHERENCE_CHECK_SCHEMA,
+        "references_quality": {
+            "type": "object",
+            "properties": {
+                "score": {"type": "number", "minimum": 0, "maximum": 10},
+                "issues": {"type": "array", "items": {"type": "string"}}
+            },
+            "required": ["score", "issues"]
+        },
+        "overall_score": {"type": "number", "minimum": 0, "maximum": 10},
+        "blocking_issues": {"type": "array", "items": {"type": "string"}},
+        "recommendations": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": [
+        "physical_coherence",
+        "economic_coherence",
+        "temporal_coherence",
+        "references_quality",
+        "overall_score",
+        "blocking_issues",
+        "recommendations"
+    ]
+}
+
+
+def create_session() -> httpx.AsyncClient:
+    """Crée un client HTTP partageable entre services"""
+    return httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+# Champs obligatoires d'une proposition (ordre conservé pour les rapports)
+REQUIRED_FIELDS_ORDER = (
+    "title",
+    "domain",
+    "description",
+    "co2_reduction_estimate",
+    "implementation_cost",
+    "timeline",
+    "stakeholders",
+    "prerequisites",
+    "risks",
+    "scientific_references"
+)
+REQUIRED_FIELDS = frozenset(REQUIRED_FIELDS_ORDER)
+
+# Scénarios de réduction CO2: (adoption, efficacité)
+CO2_SCENARIO_NAMES = ("pessimistic", "realistic", "optimistic")
+CO2_SCENARIO_PARAMS = np.array([
+    [0.3, 0.7],
+    [0.6, 0.85],
+    [0.9, 0.95],
+])
+CO2_SCENARIO_PARAMS.setflags(write=False)
+
+# Horizons de simulation, partagés en lecture seule entre les appels
+_TIMELINE = np.arange(0, 120)  # 10 ans, pas mensuel
+_TIMELINE.setflags(write=False)
+_CASH_FLOW_YEARS = 20
+_DISCOUNT_RATE = 0.03
+_DISCOUNT_3PCT_20Y = (1.0 + _DISCOUNT_RATE) ** np.arange(_CASH_FLOW_YEARS)
+_DISCOUNT_3PCT_20Y.setflags(write=False)
+
 
 class ValidationResult(BaseModel):
     """Résultat de validation"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     valid: bool
     score: float = Field(ge=0, le=10)
     issues: List[str] = Field(default_factory=list)
@@ -32,19 +224,30 @@ class ProposalValidator:
     Validateur de propositions climatiques
     """
     
-    def __init__(self, llm_endpoint: str = "http://deepseek-service:8000/v1"):
+    def __init__(
+        self,
+        llm_endpoint: str = "http://deepseek-service:8000/v1",
+        session: Optional[httpx.AsyncClient] = None
+    ):
         self.llm_endpoint = llm_endpoint
-        self.session: Optional[aiohttp.ClientSession] = None
+        # Une session injectée reste la propriété de l'appelant
+        self.session: Optional[httpx.AsyncClient] = session
+        self._owns_session = session is None
+        self._exact_cache: "OrderedDict[str, str]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
         self.logger = logger.bind(service="validator")
     
     async def initialize(self):
         """Initialise les connexions"""
-        self.session = aiohttp.ClientSession()
+        if self.session is None:
+            self.session = create_session()
+            self._owns_session = True
     
     async def shutdown(self):
         """Ferme les connexions"""
-        if self.session:
-            await self.session.close()
+        if self.session and self._owns_session:
+            await self.session.aclose()
+        self.session = None
     
     async def validate_proposal(self, proposal: Dict[str, Any]) -> ValidationResult:
         """
@@ -52,6 +255,13 @@ class ProposalValidator:
         """
         self.logger.info("validating_proposal", proposal_id=proposal.get("id"))
         
+        # Proposition complète: la requête LLM part avant le contrôle
+        # structurel, qui s'exécute pendant l'aller-retour réseau
+        coherence_task = None
+        if REQUIRED_FIELDS <= proposal.keys():
+            coherence_task = asyncio.create_task(self.llm_coherence_check(proposal))
+            await asyncio.sleep(0)
+        
         # 1. Validation structurelle
         structure_check = self.check_required_fields(proposal)
         
@@ -63,7 +273,7 @@ class ProposalValidator:
             )
         
         # 2. Validation scientifique par LLM
-        coherence_check = await self.llm_coherence_check(proposal)
+        coherence_check = await coherence_task
         
         # 3. Calcul du score final
         final_score = (structure_check["score"] + coherence_check["overall_score"]) / 2
@@ -86,22 +296,15 @@ class ProposalValidator:
         """
         Vérifie que tous les champs obligatoires sont présents
         """
-        required_fields = [
-            "title",
-            "domain",
-            "description",
-            "co2_reduction_estimate",
-            "implementation_cost",
-            "timeline",
-            "stakeholders",
-            "prerequisites",
-            "risks",
-            "scientific_references"
-        ]
-        
-        missing = [field for field in required_fields if field not in proposal]
-        
-        score = (len(required_fields) - len(missing)) / len(required_fields)
+        # Cas courant: proposition complète, une seule inclusion d'ensembles
+        if REQUIRED_FIELDS <= proposal.keys():
+            missing = []
+        else:
+            missing = [
+                field for field in REQUIRED_FIELDS_ORDER if field not in proposal
+            ]
+        
+        score = (len(REQUIRED_FIELDS) - len(missing)) / len(REQUIRED_FIELDS)
         
         return {
             "valid": len(missing) == 0,
@@ -113,63 +316,67 @@ class ProposalValidator:
         """
         Vérifie la cohérence scientifique avec un LLM (DeepSeek)
         """
-        prompt = f"""Tu es un expert scientifique chargé de valider des propositions climatiques.
-
-Analyse cette proposition selon ces critères:
-
-1. COHÉRENCE PHYSIQUE:
-   - Les chiffres de réduction CO2 sont-ils réalistes?
-   - Les ordres de grandeur sont-ils corrects?
-   - Y a-t-il des violations de lois physiques?
-
-2. COHÉRENCE ÉCONOMIQUE:
-   - Le ratio coût/impact est-il dans des standards acceptables (<500 CHF/tonne CO2)?
-   - Les coûts sont-ils estimés de façon crédible?
-
-3. COHÉRENCE TEMPORELLE:
-   - Le timeline est-il réaliste?
-   - Les étapes sont-elles logiquement ordonnées?
-
-4. QUALITÉ DES RÉFÉRENCES:
-   - Les sources citées sont-elles pertinentes?
-   - Manque-t-il des références essentielles?
-
-PROPOSITION:
-{json.dumps(proposal, indent=2, ensure_ascii=False)}
-
-Réponds UNIQUEMENT avec un objet JSON valide:
-{{
-    "physical_coherence": {{"valid": true/false, "issues": ["issue1"]}},
-    "economic_coherence": {{"valid": true/false, "issues": []}},
-    "temporal_coherence": {{"valid": true/false, "issues": []}},
-    "references_quality": {{"score": 0-10, "issues": []}},
-    "overall_score": 0-10,
-    "blocking_issues": [],
-    "recommendations": ["rec1", "rec2"]
-}}
-
-NE RÉPONDS QU'AVEC LE JSON.
+        prompt = f"""PROPOSITION:
+{_dumps(proposal, indent=True)}
 """
         
+        # Une proposition re-validée produit exactement le même prompt
+        cache_key = exact_cache_key(
+            "deepseek", prompt, 0.1, COHERENCE_MAX_TOKENS, COHERENCE_SYSTEM_PROMPT
+        )
+        cached = self._exact_cache.get(cache_key)
+        if cached is not None:
+            self._exact_cache.move_to_end(cache_key)
+            self.stats["hits"] += 1
+            return _extract_json(cached)
+        self.stats["misses"] += 1
+        
         try:
-            if not self.session:
-                await self.initialize()
+            if self.session is None:
+                raise RuntimeError("ProposalValidator not initialized")
             
-            async with self.session.post(
+            payload = {
+                "model": "deepseek",
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": COHERENCE_SYSTEM_PROMPT,
+                        "cache_control": {"type": "ephemeral"}
+                    },
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": 0.1,
+                "max_tokens": COHERENCE_MAX_TOKENS,
+                "response_format": {"type": "json_object"},
+                "guided_json": COHERENCE_RESPONSE_SCHEMA
+            }
+            response = await self.session.post(
                 f"{self.llm_endpoint}/chat/completions",
-                json={
-                    "model": "deepseek",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.1,
-                    "max_tokens": 2000
-                }
-            ) as response:
-                data = await response.json()
-                content = data["choices"][0]["message"]["content"]
-                
-                # Parse le JSON de la réponse
-                result = json.loads(content)
-                return result
+                content=_dumps(payload),
+                headers=JSON_HEADERS
+            )
+            response.raise_for_status()
+            data = _loads(response.content)
+            content = data["choices"][0]["message"]["content"]
+            
+            usage = data.get("usage") or {}
+            if usage:
+                details = usage.get("prompt_tokens_details") or {}
+                self.logger.debug(
+                    "llm_usage",
+                    prompt_tokens=usage.get("prompt_tokens"),
+                    cache_read_input_tokens=usage.get(
+                        "cache_read_input_tokens", details.get("cached_tokens")
+                    )
+                )
+            
+            # Parse le JSON de la réponse
+            result = _extract_json(content)
+            
+            self._exact_cache[cache_key] = content
+            if len(self._exact_cache) > EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+            return result
         
         except Exception as e:
             self.logger.error("llm_coherence_check_failed", error=str(e))
@@ -216,29 +423,27 @@ class QuickSimulator:
         base_reduction = proposal.get("co2_reduction_estimate", 1000)  # tonnes/an
         timeline_months = proposal.get("timeline", 12)
         
-        # Courbe d'adoption (logistique)
-        timeline = np.arange(0, 120)  # 10 ans
+        # Courbe d'adoption (logistique), commune aux trois scénarios
+        s_curve = 1 / (1 + np.exp(-0.1 * (_TIMELINE - timeline_months * 2)))
         
-        scenarios = {}
+        # Une ligne par scénario: (adoption, efficacité)
+        adoption = s_curve[None, :] * CO2_SCENARIO_PARAMS[:, 0:1]
         
-        for scenario_name, params in [
-            ("pessimistic", {"adoption": 0.3, "efficiency": 0.7}),
-            ("realistic", {"adoption": 0.6, "efficiency": 0.85}),
-            ("optimistic", {"adoption": 0.9, "efficiency": 0.95})
-        ]:
-            # S-curve adoption
-            adoption = 1 / (1 + np.exp(-0.1 * (timeline - timeline_months * 2)))
-            adoption *= params["adoption"]
-            
-            # Réduction mensuelle
-            monthly_reduction = base_reduction / 12 * adoption * params["efficiency"]
-            cumulative = np.cumsum(monthly_reduction)
-            
-            scenarios[scenario_name] = {
-                "monthly_reduction": monthly_reduction.tolist()[:12],  # 1ère année
-                "total_10y": float(cumulative[-1]),
-                "peak_monthly": float(np.max(monthly_reduction))
+        # Réduction mensuelle
+        monthly_reduction = base_reduction / 12 * adoption * CO2_SCENARIO_PARAMS[:, 1:2]
+        cumulative = np.cumsum(monthly_reduction, axis=1)
+        first_year = monthly_reduction[:, :12].tolist()  # 1ère année
+        totals = cumulative[:, -1].tolist()
+        peaks = monthly_reduction.max(axis=1).tolist()
+        
+        scenarios = {
+            name: {
+                "monthly_reduction": first_year[i],
+                "total_10y": totals[i],
+                "peak_monthly": peaks[i]
             }
+            for i, name in enumerate(CO2_SCENARIO_NAMES)
+        }
         
         return {
             "scenarios": scenarios,
@@ -265,31 +470,17 @@ class QuickSimulator:
         savings_annual = co2_reduction_annual * carbon_price * 1.3  # +30% co-bénéfices
         
         # Cash flow sur 20 ans
-        years = 20
-        cash_flow = []
-        
-        for year in range(years):
-            if year == 0:
-                cf = -capex
-            else:
-                cf = savings_annual - opex_annual
-            cash_flow.append(cf)
+        cash_flow = np.full(_CASH_FLOW_YEARS, savings_annual - opex_annual, dtype=float)
+        cash_flow[0] = -capex
         
         cumulative_cf = np.cumsum(cash_flow)
         
-        # Payback
-        payback_year = None
-        for i, cf in enumerate(cumulative_cf):
-            if cf > 0:
-                payback_year = i
-                break
+        # Payback: première année où le cumul devient positif
+        positive = cumulative_cf > 0
+        payback_year = int(np.argmax(positive)) if positive[-1] else None
         
         # NPV (discount 3%)
-        discount_rate = 0.03
-        npv = sum([
-            cf / ((1 + discount_rate) ** year)
-            for year, cf in enumerate(cash_flow)
-        ])
+        npv = float((cash_flow / _DISCOUNT_3PCT_20Y).sum())
         
         # Coût par tonne CO2
         cost_per_tonne = capex / (co2_reduction_annual * 10)  # Sur 10 ans
@@ -315,26 +506,15 @@ class QuickSimulator:
         p = 0.02  # Innovation coefficient
         q = 0.38  # Imitation coefficient
         
-        timeline = np.arange(0, 120)
         m = 1.0  # Market potential normalisé
         
-        # Bass diffusion
-        adoption = []
-        cumulative_adoption = 0
-        
-        for t in timeline:
-            if t == 0:
-                adoption.append(p * m)
-            else:
-                f_t = (p + q * cumulative_adoption / m) * (m - cumulative_adoption)
-                adoption.append(f_t)
-            cumulative_adoption += adoption[-1]
-        
-        adoption_curve = np.cumsum(adoption) / m
+        # Bass diffusion, solution analytique F(t) évaluée en fin de mois
+        decay = np.exp(-(p + q) * (_TIMELINE + 1))
+        adoption_curve = (1 - decay) / (1 + (q / p) * decay) / m
         
         return {
             "adoption_10y": float(adoption_curve[-1]),
-            "adoption_curve": adoption_curve.tolist()[::12],  # Annuel
+            "adoption_curve": adoption_curve[::12].tolist(),  # Annuel
             "acceptability_score": 7.5,  # Placeholder
             "main_barriers": ["initial_cost", "behavior_change"],
             "enabling_factors": ["co_benefits", "social_proof"]
@@ -370,18 +550,17 @@ async def main():
         # Validation
         validation = await validator.validate_proposal(test_proposal)
         print("\n=== VALIDATION ===")
-        print(json.dumps(validation.dict(), indent=2, ensure_ascii=False))
+        print(_dumps(validation.model_dump(), indent=True))
         
         # Simulation rapide
         if validation.valid:
             simulation = await simulator.simulate(test_proposal)
             print("\n=== SIMULATION RAPIDE ===")
-            print(json.dumps(simulation, indent=2, ensure_ascii=False))
+            print(_dumps(simulation, indent=True))
     
     finally:
         await validator.shutdown()
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -7,35 +7,226 @@ compatible with the GitHub Actions workflow.
 """
 
 import argparse
+import functools
+import hashlib
 import json
+import os
 import sys
-from pathlib import Path
-from typing import Dict, Any
-from datetime import datetime
+import time
+import traceback
+from operator import itemgetter
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard json module
+    orjson = None
+
+try:
+    import fastjsonschema
+except ImportError:  # Fall back to the field-by-field checks only
+    fastjsonschema = None
+
+
+_REQUIRED_FIELDS = (
+    "id", "title", "domain", "description",
+    "co2_reduction_estimate", "implementation_cost", "timeline"
+)
+_DEFAULT_PREREQS = ("Budget approved", "Stakeholder consultation")
+_DEFAULT_REFS = ("IPCC AR6", "Local emission factors")
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+_GET_DESC = itemgetter("description")
+
+# Proposals at least this large are streamed with ijson (see load_proposal_slim)
+STREAM_THRESHOLD_BYTES = 1 << 20
+
+# The only paths adapt_proposal_format reads from a proposal
+_SLIM_PATHS = frozenset({
+    "id", "title", "domain", "description",
+    "content.impact.co2_reduction_tonnes_yearly",
+    "content.budget.total_chf",
+    "content.implementation.total_duration_years",
+    "content.stakeholders",
+    "content.risks"
+})
+
+# ASCII status tags, readable on any CI console encoding
+_TAG_OK = "[OK]"
+_TAG_FAIL = "[FAIL]"
+_TAG_WARN = "[WARN]"
+_TAG_TIP = "[TIP]"
+_TAG_SCAN = "[SCAN]"
+_TAG_SAVED = "[SAVED]"
+_TAG_DONE = "[DONE]"
+
+# Validation results already computed for identical proposal files
+CACHE_DIR = os.environ.get(
+    "VALIDATOR_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "climate-ai", "validator")
+)
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Set VALIDATOR_DEBUG=1 to get full tracebacks on errors
+DEBUG = os.environ.get("VALIDATOR_DEBUG") == "1"
+
+# A non-empty value: the schema counterpart of the `not proposal.get(field)` check
+_NON_EMPTY = {"not": {"enum": [None, False, 0, "", [], {}]}}
+_POSITIVE_NUMBER = {"type": "number", "exclusiveMinimum": 0}
+
+# Everything simple_validation reports as an issue; a proposal matching
+# this schema has no issues at all
+PROPOSAL_SCHEMA = {
+    "type": "object",
+    "required": list(_REQUIRED_FIELDS),
+    "properties": {
+        "id": _NON_EMPTY,
+        "title": _NON_EMPTY,
+        "domain": _NON_EMPTY,
+        "description": _NON_EMPTY,
+        "co2_reduction_estimate": _POSITIVE_NUMBER,
+        "implementation_cost": _POSITIVE_NUMBER,
+        "timeline": _POSITIVE_NUMBER
+    }
+}
+
+# Shape of content.risks in a generated proposal
+RISKS_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "required": ["description"],
+        "properties": {"description": {"type": "string"}}
+    }
+}
+
+# Compiled once at import into specialised Python functions
+if fastjsonschema is not None:
+    _VALIDATE = fastjsonschema.compile(PROPOSAL_SCHEMA)
+    _VALIDATE_RISKS = fastjsonschema.compile(RISKS_SCHEMA)
+else:
+    _VALIDATE = _VALIDATE_RISKS = None
 
 
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
-        description="Validate a climate proposal"
+        description="Validate one or more climate proposals"
     )
-    parser.add_argument(
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument(
         "--proposal",
-        required=True,
         help="Input JSON file with the proposal"
     )
+    inputs.add_argument(
+        "--proposals",
+        nargs="+",
+        help="Several proposal JSON files, validated in a single process"
+    )
     parser.add_argument(
         "--output",
-        required=True,
-        help="Output JSON file for validation results"
+        help="Output JSON file for validation results (with --proposal)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="Output directory for validation results (with --proposals)"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for --proposals (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Do not read or write cached results in {CACHE_DIR}"
+    )
+    args = parser.parse_args()
+
+    if args.proposal is not None and args.output is None:
+        parser.error("--proposal requires --output")
+    if args.proposals is not None:
+        if args.output_dir is None:
+            parser.error("--proposals requires --output-dir")
+        names = [output_name(path) for path in args.proposals]
+        if len(set(names)) != len(names):
+            parser.error("several proposals map to the same output file name")
+    return args
+
+
+def output_name(proposal_path: str) -> str:
+    """
+    Name of the validation file for a proposal in --output-dir.
+
+    Proposals stored as <id>/proposal.json (the domains/ layout) are named
+    after their directory, other files after their own name.
+    """
+    directory, filename = os.path.split(os.path.abspath(proposal_path))
+    stem = os.path.splitext(filename)[0]
+    if stem == "proposal":
+        stem = os.path.basename(directory)
+    return f"{stem}.json"
 
 
 def load_proposal(proposal_path: str) -> Dict[str, Any]:
     """Load the proposal from JSON file."""
-    with open(proposal_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(proposal_path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_proposal_slim(proposal_path: str) -> Dict[str, Any]:
+    """
+    Stream the proposal with ijson, keeping only the paths in _SLIM_PATHS.
+
+    The result has the same nesting as the full proposal, so it can be
+    passed to adapt_proposal_format unchanged. ijson is imported here, as
+    only large proposals need it; parse errors are raised as ValueError.
+    """
+    import ijson
+
+    slim: Dict[str, Any] = {}
+    builder = None
+    depth = 0
+
+    with open(proposal_path, "rb") as f:
+        try:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is None:
+                    if prefix not in _SLIM_PATHS:
+                        continue
+                    builder = ijson.ObjectBuilder()
+                    path = prefix
+
+                builder.event(event, value)
+                if event in ("start_map", "start_array"):
+                    depth += 1
+                elif event in ("end_map", "end_array"):
+                    depth -= 1
+
+                if depth == 0:
+                    *parents, leaf = path.split(".")
+                    node = slim
+                    for key in parents:
+                        node = node.setdefault(key, {})
+                    node[leaf] = builder.value
+                    builder = None
+        except ijson.JSONError as e:
+            raise ValueError(f"invalid JSON: {e}") from e
+
+    return slim
+
+
+def read_proposal(proposal_path: str) -> Dict[str, Any]:
+    """Load the proposal, streaming it when it is large and ijson is available."""
+    if os.path.getsize(proposal_path) >= STREAM_THRESHOLD_BYTES:
+        try:
+            return load_proposal_slim(proposal_path)
+        except ImportError:  # ijson not installed: load the whole file
+            pass
+    return load_proposal(proposal_path)
 
 
 def adapt_proposal_format(proposal: Dict[str, Any]) -> Dict[str, Any]:
@@ -45,26 +236,52 @@ def adapt_proposal_format(proposal: Dict[str, Any]) -> Dict[str, Any]:
     The validator expects certain fields that may not be in the generated proposal,
     so we need to map or create them.
     """
-    # Extract values from the content structure
-    content = proposal.get("content", {})
+    # Extract the content sub-sections once
+    content = proposal.get("content") or {}
+    impact = content.get("impact") or {}
+    budget = content.get("budget") or {}
+    implementation = content.get("implementation") or {}
+    risks = content.get("risks") or []
+
+    # Risks matching RISKS_SCHEMA (the normal case) are mapped with the C
+    # itemgetter; otherwise malformed entries are dropped rather than turned
+    # into empty descriptions, so that no valid risk means no risks
+    if _matches(_VALIDATE_RISKS, risks):
+        risk_descriptions = list(map(_GET_DESC, risks))
+    else:
+        risk_descriptions = [
+            r["description"] for r in risks
+            if isinstance(r, dict) and isinstance(r.get("description"), str)
+        ]
 
     adapted = {
         "id": proposal.get("id", "unknown"),
         "title": proposal.get("title", ""),
         "domain": proposal.get("domain", "unknown"),
         "description": proposal.get("description", ""),
-        "co2_reduction_estimate": content.get("impact", {}).get("co2_reduction_tonnes_yearly", 0),
-        "implementation_cost": content.get("budget", {}).get("total_chf", 0),
-        "timeline": content.get("implementation", {}).get("total_duration_years", 1) * 12,  # Convert to months
+        "co2_reduction_estimate": impact.get("co2_reduction_tonnes_yearly", 0),
+        "implementation_cost": budget.get("total_chf", 0),
+        "timeline": implementation.get("total_duration_years", 1) * 12,  # Convert to months
         "stakeholders": content.get("stakeholders", []),
-        "prerequisites": ["Budget approved", "Stakeholder consultation"],  # Default values
-        "risks": [risk.get("description", "") for risk in content.get("risks", [])],
-        "scientific_references": ["IPCC AR6", "Local emission factors"]  # Default values
+        "prerequisites": list(_DEFAULT_PREREQS),  # Default values
+        "risks": risk_descriptions,
+        "scientific_references": list(_DEFAULT_REFS)  # Default values
     }
 
     return adapted
 
 
+def _matches(validate, data: Any) -> bool:
+    """Return True when the compiled schema validator accepts the data."""
+    if validate is None:
+        return False
+    try:
+        validate(data)
+    except fastjsonschema.JsonSchemaException:
+        return False
+    return True
+
+
 def simple_validation(proposal: Dict[str, Any]) -> Dict[str, Any]:
     """
     Perform a simple validation without async/LLM dependencies.
@@ -75,145 +292,309 @@ def simple_validation(proposal: Dict[str, Any]) -> Dict[str, Any]:
     recommendations = []
     score = 10.0
 
-    # Check required fields
-    required_fields = [
-        "id", "title", "domain", "description",
-        "co2_reduction_estimate", "implementation_cost", "timeline"
-    ]
-
-    for field in required_fields:
-        if not proposal.get(field):
-            issues.append(f"Missing or empty field: {field}")
+    # Read each field once
+    co2 = proposal.get("co2_reduction_estimate") or 0
+    cost = proposal.get("implementation_cost") or 0
+    timeline = proposal.get("timeline") or 0
+    stakeholders = proposal.get("stakeholders")
+    risks = proposal.get("risks")
+
+    if not _matches(_VALIDATE, proposal):
+        # Check required fields
+        for field, value in (
+            ("id", proposal.get("id")),
+            ("title", proposal.get("title")),
+            ("domain", proposal.get("domain")),
+            ("description", proposal.get("description")),
+            ("co2_reduction_estimate", co2),
+            ("implementation_cost", cost),
+            ("timeline", timeline)
+        ):
+            if not value:
+                issues.append(f"Missing or empty field: {field}")
+                score -= 1.0
+
+        # Check CO2 reduction is positive
+        if co2 <= 0:
+            issues.append("CO2 reduction estimate must be positive")
+            score -= 2.0
+
+        # Check implementation cost is positive
+        if cost <= 0:
+            issues.append("Implementation cost must be positive")
+            score -= 2.0
+
+        # Check timeline is positive
+        if timeline <= 0:
+            issues.append("Timeline must be positive")
             score -= 1.0
 
-    # Check CO2 reduction is positive
-    if proposal.get("co2_reduction_estimate", 0) <= 0:
-        issues.append("CO2 reduction estimate must be positive")
-        score -= 2.0
-
     # Check implementation cost is reasonable
-    cost = proposal.get("implementation_cost", 0)
-    if cost <= 0:
-        issues.append("Implementation cost must be positive")
-        score -= 2.0
-    elif cost > 1_000_000_000:  # 1 billion CHF
+    if cost > 1_000_000_000:  # 1 billion CHF
         recommendations.append("Very high implementation cost - consider splitting into phases")
 
     # Check timeline is reasonable
-    timeline = proposal.get("timeline", 0)
-    if timeline <= 0:
-        issues.append("Timeline must be positive")
-        score -= 1.0
-    elif timeline > 120:  # 10 years
+    if timeline > 120:  # 10 years
         recommendations.append("Very long timeline - consider shorter milestones")
 
     # Calculate cost per tonne CO2
-    co2_10y = proposal.get("co2_reduction_estimate", 1) * 10  # 10 years
+    # A missing estimate counts as 1 tonne/year here, as it always has
+    co2_10y = (co2 if "co2_reduction_estimate" in proposal else 1) * 10  # 10 years
     cost_per_tonne = cost / co2_10y if co2_10y > 0 else float('inf')
 
     if cost_per_tonne > 500:
         recommendations.append(f"High cost per tonne CO2: {cost_per_tonne:.2f} CHF/tonne")
 
     # Check stakeholders
-    if not proposal.get("stakeholders"):
+    if not stakeholders:
         recommendations.append("No stakeholders identified - consider adding key actors")
 
     # Check risks
-    if not proposal.get("risks"):
+    if not risks:
         recommendations.append("No risks identified - consider potential obstacles")
 
     # Ensure score is in [0, 10]
-    score = max(0.0, min(10.0, score))
+    score = 0.0 if score < 0.0 else (10.0 if score > 10.0 else score)
 
     # Proposal is valid if score >= 7 and no critical issues
     is_valid = score >= 7.0 and len(issues) < 3
 
     return {
         "valid": is_valid,
-        "score": round(score, 1),
+        "score": int(score * 10 + 0.5) / 10.0,  # score >= 0 after the clamp
         "issues": issues,
         "recommendations": recommendations,
         "metadata": {
             "validation_method": "simple",
-            "validated_at": datetime.utcnow().isoformat() + "Z",
+            "validated_at": time.strftime(_TIMESTAMP_FORMAT, time.gmtime()),
             "validator_version": "1.0"
         },
         "details": {
             "cost_per_tonne_co2": round(cost_per_tonne, 2) if cost_per_tonne != float('inf') else "N/A",
             "timeline_months": timeline,
-            "annual_co2_reduction": proposal.get("co2_reduction_estimate", 0)
+            "annual_co2_reduction": co2
         }
     }
 
 
-def export_validation(validation: Dict[str, Any], output_path: str):
-    """Export validation results to JSON file."""
-    output_file = Path(output_path)
-    output_file.parent.mkdir(parents=True, exist_ok=True)
+def _write_bytes(path: str, payload: bytes):
+    """Write bytes to a file, creating its directory if needed."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    # Write the encoded bytes straight to the file descriptor, without the
+    # text and buffered layers of open(); os.write may write partially
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(validation, f, indent=2, ensure_ascii=False)
 
-    print(f"💾 Validation results exported to: {output_path}")
+def export_validation(validation: Dict[str, Any], output_path: str) -> bytes:
+    """Export validation results to JSON file and return the written bytes."""
+    if orjson is not None:
+        payload = orjson.dumps(validation, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(validation, indent=2, ensure_ascii=False).encode("utf-8")
 
+    _write_bytes(output_path, payload)
 
-def print_summary(validation: Dict[str, Any]):
-    """Print a summary of the validation results."""
-    print("\n" + "="*60)
-    print("✅ VALIDATION SUMMARY")
-    print("="*60)
+    print(f"{_TAG_SAVED} Validation results exported to: {output_path}")
+    return payload
 
-    status = "✅ VALID" if validation["valid"] else "❌ INVALID"
-    print(f"\nStatus: {status}")
-    print(f"Score: {validation['score']}/10")
+
+@functools.lru_cache(maxsize=None)
+def _validator_fingerprint() -> bytes:
+    """Digest of this file, so cached results expire when the validator changes."""
+    with open(__file__, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).digest()
+
+
+def cache_path(proposal_path: str) -> str:
+    """Return the result cache file for the current content of a proposal file."""
+    digest = hashlib.blake2b(_validator_fingerprint(), digest_size=16)
+    with open(proposal_path, "rb") as f:
+        for chunk in iter(functools.partial(f.read, _HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return os.path.join(CACHE_DIR, f"{digest.hexdigest()}.json")
+
+
+def load_cached_validation(cache_file: str) -> Optional[Dict[str, Any]]:
+    """Return the cached validation result, or None if absent or unreadable."""
+    try:
+        return load_proposal(cache_file)
+    except (OSError, ValueError):
+        return None
+
+
+def print_summary(validation: Dict[str, Any], proposal_path: Optional[str] = None):
+    """Print a summary of the validation results, labelled with the proposal file if given."""
+    status = f"{_TAG_OK} VALID" if validation["valid"] else f"{_TAG_FAIL} INVALID"
+    parts = [
+        "\n" + "="*60,
+        f"{_TAG_OK} VALIDATION SUMMARY",
+        "="*60
+    ]
+    if proposal_path is not None:
+        parts.append(f"\nProposal: {proposal_path}")
+    parts.extend([
+        f"\nStatus: {status}",
+        f"Score: {validation['score']}/10"
+    ])
 
     if validation["issues"]:
-        print(f"\n⚠️  Issues ({len(validation['issues'])}):")
-        for issue in validation["issues"]:
-            print(f"   - {issue}")
+        parts.append(f"\n{_TAG_WARN} Issues ({len(validation['issues'])}):")
+        parts.extend(f"   - {issue}" for issue in validation["issues"])
 
     if validation["recommendations"]:
-        print(f"\n💡 Recommendations ({len(validation['recommendations'])}):")
-        for rec in validation["recommendations"]:
-            print(f"   - {rec}")
+        parts.append(f"\n{_TAG_TIP} Recommendations ({len(validation['recommendations'])}):")
+        parts.extend(f"   - {rec}" for rec in validation["recommendations"])
 
-    print("\n" + "="*60)
+    parts.append("\n" + "="*60)
 
+    # One write for the whole summary
+    sys.stdout.write("\n".join(parts) + "\n")
+    sys.stdout.flush()
 
-def main():
-    """Main entry point."""
-    args = parse_args()
 
-    try:
-        print(f"🔍 Validating proposal from: {args.proposal}")
+def _fail(message: str) -> int:
+    """Report an error on stderr and return the failure exit code."""
+    print(f"{_TAG_FAIL} Error: {message}", file=sys.stderr)
+    if DEBUG:
+        traceback.print_exc()
+    return 1
+
+
+def validate_file(proposal_path: str, output_path: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Validate one proposal file and export the result.
 
+    Returns:
+        The validation result, or None if the proposal could not be
+        validated (the error has been reported on stderr)
+    """
+    print(f"{_TAG_SCAN} Validating proposal from: {proposal_path}")
+
+    # Reuse the result of a previous run on the same file, if any
+    cache_file = None
+    validation = None
+    if use_cache:
+        try:
+            cache_file = cache_path(proposal_path)
+        except OSError as e:
+            _fail(f"cannot load proposal {proposal_path}: {e}")
+            return None
+        validation = load_cached_validation(cache_file)
+
+    if validation is None:
         # Load the proposal
-        proposal = load_proposal(args.proposal)
+        try:
+            proposal = read_proposal(proposal_path)
+        except (OSError, ValueError) as e:
+            _fail(f"cannot load proposal {proposal_path}: {e}")
+            return None
+
+        # Adapt format and perform validation
+        try:
+            adapted_proposal = adapt_proposal_format(proposal)
+            validation = simple_validation(adapted_proposal)
+        except (AttributeError, TypeError) as e:
+            _fail(f"malformed proposal {proposal_path}: {e}")
+            return None
+    else:
+        cache_file = None  # Already cached
+        print(f"{_TAG_OK} Using cached result: {proposal_path} is unchanged")
+
+    # Export results
+    try:
+        payload = export_validation(validation, output_path)
+    except (OSError, TypeError) as e:
+        _fail(f"cannot export validation of {proposal_path}: {e}")
+        return None
+
+    if cache_file is not None:
+        try:
+            _write_bytes(cache_file, payload)
+        except OSError:  # The cache is best-effort
+            pass
+
+    return validation
+
+
+def _validate_one(
+    proposal_path: str, output_dir: str, use_cache: bool
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Validate one proposal of a batch into output_dir (run in a worker process).
 
-        # Adapt format if needed
-        adapted_proposal = adapt_proposal_format(proposal)
+    Returns:
+        The proposal path with its validation result (None on failure), so
+        that each result coming back from a worker carries its file
+    """
+    output_path = os.path.join(output_dir, output_name(proposal_path))
+    return proposal_path, validate_file(proposal_path, output_path, use_cache)
 
-        # Perform validation
-        validation = simple_validation(adapted_proposal)
 
-        # Export results
-        export_validation(validation, args.output)
+def main():
+    """Main entry point."""
+    args = parse_args()
+
+    if args.proposals is None:
+        validation = validate_file(args.proposal, args.output, not args.no_cache)
+        if validation is None:
+            return 1
 
         # Print summary
         print_summary(validation)
 
         # Exit with appropriate code
         if validation["valid"]:
-            print("\n✨ Validation passed!")
+            print(f"\n{_TAG_DONE} Validation passed!")
             return 0
         else:
-            print("\n❌ Validation failed!")
+            print(f"\n{_TAG_FAIL} Validation failed!")
             return 1
 
-    except Exception as e:
-        print(f"❌ Error: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
+    # Batch mode: proposals are independent, spread them over worker processes
+    total = len(args.proposals)
+    workers = max(1, min(args.jobs, total))
+    output_dirs = [args.output_dir] * total
+    use_cache = [not args.no_cache] * total
+
+    if workers == 1:
+        results = list(map(_validate_one, args.proposals, output_dirs, use_cache))
+    else:
+        # Imported here so that single-file runs do not pay for it
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Large enough chunks to keep the inter-process traffic low
+        chunksize = max(1, total // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                _validate_one, args.proposals, output_dirs, use_cache, chunksize=chunksize
+            ))
+
+    passed = 0
+    failed_files = []
+    for proposal_path, validation in results:
+        if validation is None:
+            failed_files.append(proposal_path)
+            continue
+        print_summary(validation, proposal_path)
+        passed += validation["valid"]
+
+    if failed_files:
+        print(f"\n{_TAG_FAIL} Could not validate {len(failed_files)} file(s):")
+        for proposal_path in failed_files:
+            print(f"   - {proposal_path}")
+
+    if passed == total:
+        print(f"\n{_TAG_DONE} {passed}/{total} proposals passed validation!")
+        return 0
+    else:
+        print(f"\n{_TAG_FAIL} {passed}/{total} proposals passed validation")
         return 1
 
 